@@ -4,6 +4,8 @@ import logging
 import os
 import re
 from dataclasses import dataclass, field
+from datetime import date
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Optional
 
@@ -11,6 +13,9 @@ import yaml
 
 logger = logging.getLogger(__name__)
 
+# LibYAML-backed loader when PyYAML was built with it; same safe semantics
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ConfigurationError(Exception):
     """Configuration is invalid or missing required fields."""
@@ -43,6 +48,16 @@ class DateRange:
     after: Optional[str] = None
     before: Optional[str] = None
 
+    @cached_property
+    def after_date(self) -> Optional[date]:
+        """Parsed ``after`` bound, parsed once and reused for every show."""
+        return date.fromisoformat(self.after) if self.after else None
+
+    @cached_property
+    def before_date(self) -> Optional[date]:
+        """Parsed ``before`` bound, parsed once and reused for every show."""
+        return date.fromisoformat(self.before) if self.before else None
+
 
 @dataclass(frozen=True)
 class IntRange:
@@ -70,6 +85,17 @@ class GlobalExclude:
     countries: list[str] = field(default_factory=list)
     networks: list[str] = field(default_factory=list)
 
+    @cached_property
+    def canonical(self) -> dict:
+        """Order-independent representation used for the filter hash."""
+        return {
+            "genres": tuple(sorted(self.genres)),
+            "types": tuple(sorted(self.types)),
+            "languages": tuple(sorted(self.languages)),
+            "countries": tuple(sorted(self.countries)),
+            "networks": tuple(sorted(self.networks)),
+        }
+
 
 @dataclass(frozen=True)
 class Selection:
@@ -87,6 +113,35 @@ class Selection:
     rating: Optional[FloatRange] = None
     runtime: Optional[IntRange] = None
 
+    @cached_property
+    def canonical(self) -> dict:
+        """Order-independent representation used for the filter hash."""
+        return {
+            "name": self.name,
+            "languages": tuple(sorted(self.languages)),
+            "countries": tuple(sorted(self.countries)),
+            "genres": tuple(sorted(self.genres)),
+            "types": tuple(sorted(self.types)),
+            "networks": tuple(sorted(self.networks)),
+            "status": tuple(sorted(self.status)),
+            "premiered": {
+                "after": self.premiered.after if self.premiered else None,
+                "before": self.premiered.before if self.premiered else None,
+            },
+            "ended": {
+                "after": self.ended.after if self.ended else None,
+                "before": self.ended.before if self.ended else None,
+            },
+            "rating": {
+                "min": self.rating.min if self.rating else None,
+                "max": self.rating.max if self.rating else None,
+            },
+            "runtime": {
+                "min": self.runtime.min if self.runtime else None,
+                "max": self.runtime.max if self.runtime else None,
+            },
+        }
+
 
 @dataclass(frozen=True)
 class FiltersConfig:
@@ -116,6 +171,11 @@ class StorageConfig:
 
     path: str = "/data"
 
+    @cached_property
+    def state_path(self) -> Path:
+        """Path to the operational state file (built once, reused per checkpoint)."""
+        return Path(self.path) / "state.json"
+
 
 @dataclass(frozen=True)
 class LoggingConfig:
@@ -329,7 +389,7 @@ def load_config(path: Path | None = None) -> Config:
     # Load YAML file
     try:
         with open(path, 'r') as f:
-            config_dict = yaml.safe_load(f) or {}
+            config_dict = yaml.load(f, Loader=_YAML_LOADER) or {}
     except FileNotFoundError:
         # If no config file, start with empty dict (all from env vars)
         logger.warning(f"Config file not found at {path}, using environment variables")
@@ -6,7 +6,7 @@ from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Iterator, Optional
 
-from .models import ProcessingStatus, Show
+from .models import FILTER_COLUMNS, ProcessingStatus, Show
 
 logger = logging.getLogger(__name__)
 
@@ -120,19 +120,26 @@ def migrate_schema(conn: sqlite3.Connection, from_version: int) -> None:
 class Database:
     """SQLite database wrapper for show cache."""
 
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, conn: Optional[sqlite3.Connection] = None):
         """
         Initialize database connection.
 
         Creates database file and schema if not exists.
         Enables WAL mode for better concurrency.
+
+        An already-open connection (e.g. a backup() copy of a database whose
+        schema is current) can be passed as conn instead of opening path.
         """
         self.path = path
-        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        if conn is None:
+            conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.conn = conn
         self.conn.row_factory = sqlite3.Row
 
         # Enable WAL mode for better concurrency
         self.conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable across application crashes in WAL mode and avoids an fsync per commit
+        self.conn.execute("PRAGMA synchronous=NORMAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
 
         # Initialize or migrate schema
@@ -238,8 +245,9 @@ class Database:
         limit: Optional[int] = None,
         offset: int = 0
     ) -> list[Show]:
-        """Get all shows with given processing status."""
-        query = "SELECT * FROM shows WHERE processing_status = ?"
+        """Get all shows with given processing status, ordered by TVMaze ID."""
+        # Ordered so LIMIT/OFFSET pages are stable across requests
+        query = "SELECT * FROM shows WHERE processing_status = ? ORDER BY tvmaze_id"
         params = [status]
 
         if limit is not None:
@@ -247,7 +255,7 @@ class Database:
             params.extend([limit, offset])
 
         cursor = self.conn.execute(query, params)
-        return [Show.from_db_row(row) for row in cursor.fetchall()]
+        return list(Show.from_db_rows(cursor))
 
     def get_shows_for_retry(self, now: datetime, abandon_after: timedelta) -> list[Show]:
         """
@@ -269,7 +277,7 @@ class Database:
             query,
             (ProcessingStatus.PENDING_TVDB, now.isoformat(), abandon_cutoff)
         )
-        return [Show.from_db_row(row) for row in cursor.fetchall()]
+        return list(Show.from_db_rows(cursor))
 
     def get_shows_to_abandon(self, now: datetime, abandon_after: timedelta) -> list[Show]:
         """
@@ -290,42 +298,50 @@ class Database:
             query,
             (ProcessingStatus.PENDING_TVDB, abandon_cutoff)
         )
-        return [Show.from_db_row(row) for row in cursor.fetchall()]
+        return list(Show.from_db_rows(cursor))
 
     def get_all_filtered_shows(self) -> Iterator[Show]:
         """
         Iterate all filtered shows.
 
-        Uses server-side cursor for memory efficiency.
-        Used for filter re-evaluation.
+        Rows are stepped lazily from the cursor, so only one row is held in
+        memory at a time. Used for filter re-evaluation.
         """
         cursor = self.conn.execute(
             "SELECT * FROM shows WHERE processing_status = ?",
             (ProcessingStatus.FILTERED,)
         )
 
-        while True:
-            row = cursor.fetchone()
-            if row is None:
-                break
-            yield Show.from_db_row(row)
+        yield from Show.from_db_rows(cursor)
+
+    def get_filtered_shows_for_evaluation(self) -> Iterator[Show]:
+        """
+        Iterate filtered shows that filters can re-evaluate.
+
+        Only the columns filters read are selected, and shows without a TVDB
+        ID are skipped in SQL since they can only be retried, never re-added.
+        Yielded shows carry no sync or Sonarr state.
+        """
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(FILTER_COLUMNS)} FROM shows "
+            "WHERE processing_status = ? AND tvdb_id IS NOT NULL",
+            (ProcessingStatus.FILTERED,)
+        )
+
+        yield from Show.from_filter_rows(cursor)
 
     def get_all_shows_with_tvdb(self) -> Iterator[Show]:
         """
         Iterate all shows that have a TVDB ID.
 
-        Uses server-side cursor for memory efficiency.
-        Used for selections sync to Sonarr.
+        Rows are stepped lazily from the cursor, so only one row is held in
+        memory at a time. Used for selections sync to Sonarr.
         """
         cursor = self.conn.execute(
             "SELECT * FROM shows WHERE tvdb_id IS NOT NULL"
         )
 
-        while True:
-            row = cursor.fetchone()
-            if row is None:
-                break
-            yield Show.from_db_row(row)
+        yield from Show.from_db_rows(cursor)
 
     # ============ Statistics ============
 
@@ -484,6 +500,37 @@ class Database:
         """, (ProcessingStatus.FAILED, error_message, tvmaze_id))
         self.conn.commit()
 
+    def update_refiltered_shows(
+        self,
+        now_pending: list[int],
+        refiltered: list[tuple[int, str, str]]
+    ) -> None:
+        """
+        Apply filter re-evaluation results in a single transaction.
+
+        now_pending: TVMaze IDs that now pass filters (reset to pending)
+        refiltered: (tvmaze_id, reason, category) for shows still filtered
+        """
+        if not now_pending and not refiltered:
+            return
+
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE shows SET processing_status = ? WHERE tvmaze_id = ?",
+                [(ProcessingStatus.PENDING, tvmaze_id) for tvmaze_id in now_pending]
+            )
+            self.conn.executemany("""
+                UPDATE shows SET
+                    processing_status = ?,
+                    filter_reason = ?,
+                    sonarr_series_id = NULL,
+                    error_message = NULL
+                WHERE tvmaze_id = ?
+            """, [
+                (ProcessingStatus.FILTERED, f"{category}: {reason}", tvmaze_id)
+                for tvmaze_id, reason, category in refiltered
+            ])
+
     def update_show_status(self, tvmaze_id: int, status: str) -> None:
         """Update show processing status."""
         self.conn.execute(
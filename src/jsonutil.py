@@ -0,0 +1,52 @@
+"""JSON encoding helpers backed by orjson when available."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one type covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+if orjson is not None:
+
+    def dumps(obj, sort_keys: bool = False, indent: bool = False, non_str_keys: bool = False) -> bytes:
+        """Serialize to compact (or 2-space indented) UTF-8 JSON bytes.
+
+        non_str_keys converts int/float/bool/None dict keys to strings like
+        stdlib json does, instead of raising.
+        """
+        option = 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if non_str_keys:
+            option |= orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, option=option)
+
+    def loads(data: str | bytes):
+        """Deserialize JSON from str or bytes."""
+        return orjson.loads(data)
+
+else:  # pragma: no cover
+
+    def dumps(obj, sort_keys: bool = False, indent: bool = False, non_str_keys: bool = False) -> bytes:
+        """Serialize to compact (or 2-space indented) UTF-8 JSON bytes (matches orjson output).
+
+        stdlib json always converts non-str keys, so non_str_keys is a no-op.
+        """
+        return json.dumps(
+            obj,
+            sort_keys=sort_keys,
+            indent=2 if indent else None,
+            separators=(",", ": ") if indent else (",", ":"),
+            ensure_ascii=False,
+        ).encode()
+
+    def loads(data: str | bytes):
+        """Deserialize JSON from str or bytes."""
+        return json.loads(data)
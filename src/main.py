@@ -6,21 +6,31 @@ import signal
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Optional
 
-from .clients.sonarr import SonarrClient
+from .clients.sonarr import AddResult, SonarrClient
 from .clients.tvmaze import TVMazeClient, TVMazeNotFoundError, TVMazeRateLimitError
 from .config import Config, ConfigurationError, load_config
 from .database import Database
 from .metrics import record_sync_complete, sync_initial_complete
-from .models import Decision, ProcessingStatus, Show, SyncStats
+from .models import Decision, ProcessingResult, ProcessingStatus, Show, SyncStats
 from .processor import ShowProcessor, check_filter_change
 from .scheduler import Scheduler
 from .state import SyncState
 
 logger = logging.getLogger(__name__)
 
+# Sonarr serialises commands internally; a few concurrent callers hide the
+# per-request round-trip without queueing work on its side.
+SONARR_ADD_WORKERS = 3
+
+# Initial sync persists its page checkpoint at most this often
+CHECKPOINT_INTERVAL_PAGES = 10
+CHECKPOINT_INTERVAL_SECONDS = 30
+
 
 def setup_logging(logging_config) -> None:
     """Configure application logging."""
@@ -158,36 +168,66 @@ def sync_selections_to_sonarr(
     added = 0
     failed = 0
 
-    for show, result in candidates:
-        if config.dry_run:
-            logger.info(f"[DRY RUN] Would add: {show.title} (matched: {result.reason})")
+    if config.dry_run:
+        for show, result in candidates:
+            logger.info("[DRY RUN] Would add: %s (matched: %s)", show.title, result.reason)
             added += 1
-            continue
-
-        # Lookup and add to Sonarr
-        series_data = sonarr.lookup_series(show.tvdb_id)
-        if not series_data:
-            logger.warning(f"Cannot find {show.title} in Sonarr lookup")
-            failed += 1
-            continue
+        logger.info(f"Selections sync complete: {added} added, {failed} failed")
+        return
 
-        add_result = sonarr.add_series(result.sonarr_params, series_data)
+    # Sonarr calls run on worker threads; database writes stay on this thread
+    with ThreadPoolExecutor(max_workers=SONARR_ADD_WORKERS) as executor:
+        futures = {
+            executor.submit(add_to_sonarr, sonarr, show, result): show
+            for show, result in candidates
+        }
 
-        if add_result.success:
-            db.mark_show_added(show.tvmaze_id, add_result.series_id)
-            logger.info(f"Added: {show.title}")
-            added += 1
-        elif add_result.exists:
-            db.update_show_status(show.tvmaze_id, ProcessingStatus.EXISTS)
-            added += 1  # Count as success since it's in Sonarr
-        else:
-            db.mark_show_failed(show.tvmaze_id, add_result.error)
-            logger.warning(f"Failed to add {show.title}: {add_result.error}")
-            failed += 1
+        for future in as_completed(futures):
+            show = futures[future]
+            try:
+                add_result = future.result()
+            except Exception as e:
+                # Keep draining so every other completed add is still recorded
+                logger.error("Error adding %s to Sonarr: %s", show.title, e)
+                failed += 1
+                continue
+
+            if add_result is None:
+                logger.warning("Cannot find %s in Sonarr lookup", show.title)
+                failed += 1
+            elif add_result.success:
+                db.mark_show_added(show.tvmaze_id, add_result.series_id)
+                logger.info("Added: %s", show.title)
+                added += 1
+            elif add_result.exists:
+                db.update_show_status(show.tvmaze_id, ProcessingStatus.EXISTS)
+                added += 1  # Count as success since it's in Sonarr
+            else:
+                db.mark_show_failed(show.tvmaze_id, add_result.error)
+                logger.warning("Failed to add %s: %s", show.title, add_result.error)
+                failed += 1
 
     logger.info(f"Selections sync complete: {added} added, {failed} failed")
 
 
+def add_to_sonarr(
+    sonarr: SonarrClient,
+    show: Show,
+    result: ProcessingResult
+) -> Optional[AddResult]:
+    """
+    Lookup and add a show to Sonarr.
+
+    Returns None if the show cannot be found via Sonarr lookup. Performs no
+    database writes, so it is safe to call from worker threads.
+    """
+    series_data = sonarr.lookup_series(show.tvdb_id)
+    if not series_data:
+        return None
+
+    return sonarr.add_series(result.sonarr_params, series_data)
+
+
 def main():
     """Application entry point."""
 
@@ -218,7 +258,7 @@ def main():
     storage_path.mkdir(parents=True, exist_ok=True)
 
     db = Database(storage_path / "shows.db")
-    state = SyncState.load(storage_path / "state.json")
+    state = SyncState.load(config.storage.state_path)
 
     # ============ Initialize Processor ============
     processor = ShowProcessor(config.filters, config.sonarr)
@@ -264,12 +304,11 @@ def main():
         logger.info(f"HTTP server listening on port {config.server.port}")
 
     # ============ Signal Handling ============
+    shutdown_requested = threading.Event()
+
     def shutdown(signum, frame):
         logger.info("Shutdown signal received")
-        scheduler.stop(timeout=300)
-        db.close()
-        state.save(storage_path / "state.json")
-        sys.exit(0)
+        shutdown_requested.set()
 
     signal.signal(signal.SIGTERM, shutdown)
     signal.signal(signal.SIGINT, shutdown)
@@ -285,12 +324,13 @@ def main():
         logger.info("No previous sync detected, starting initial sync...")
         scheduler.trigger_now()
 
-    # Block main thread
-    try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        shutdown(None, None)
+    # Block main thread until a shutdown signal arrives (no periodic wakeups)
+    shutdown_requested.wait()
+
+    scheduler.stop(timeout=300)
+    db.close()
+    state.save(config.storage.state_path)
+    sys.exit(0)
 
 
 def sync_cycle(
@@ -304,7 +344,7 @@ def sync_cycle(
     """Execute a single sync cycle."""
 
     stats = SyncStats(started_at=datetime.now(UTC))
-    storage_path = Path(config.storage.path)
+    state_path = config.storage.state_path
 
     try:
         if state.last_full_sync is None:
@@ -321,8 +361,8 @@ def sync_cycle(
 
         # Update state
         state.last_incremental_sync = datetime.now(UTC)
-        state.save(storage_path / "state.json")
-        state.backup(storage_path / "state.json")
+        state.save(state_path)
+        state.backup(state_path)
 
         stats.completed_at = datetime.now(UTC)
         record_sync_complete(stats, success=True)
@@ -345,35 +385,55 @@ def run_initial_sync(db, state, config, sonarr, tvmaze, processor, stats):
     """Paginate through all TVMaze shows."""
     logger.info("Starting initial full sync...")
     page = state.last_tvmaze_page
+    state_path = config.storage.state_path
+    retry_delay = parse_duration(config.sync.retry_delay)
 
-    while True:
-        try:
-            shows_data = tvmaze.get_shows_page(page)
-            if not shows_data:
-                logger.info(f"Reached end of TVMaze index at page {page}")
-                break  # End of pages
-
-            logger.info(f"Processing page {page} ({len(shows_data)} shows)")
+    # Checkpoint every few pages or seconds rather than rewriting state per page
+    last_checkpoint_page = page
+    last_checkpoint_time = time.monotonic()
 
-            for show_data in shows_data:
-                try:
-                    show = Show.from_tvmaze_response(show_data)
-                    process_single_show(db, config, sonarr, processor, show, stats)
-                    state.highest_tvmaze_id = max(state.highest_tvmaze_id, show.tvmaze_id)
-                except Exception as e:
-                    logger.error(f"Error processing show {show_data.get('id')}: {e}")
-                    continue
-
-            # Checkpoint progress
-            state.last_tvmaze_page = page
-            state.save(Path(config.storage.path) / "state.json")
-
-            page += 1
-
-        except TVMazeRateLimitError:
-            logger.warning("Rate limited, backing off...")
-            time.sleep(10)
-            continue
+    try:
+        while True:
+            try:
+                shows_data = tvmaze.get_shows_page(page)
+                if not shows_data:
+                    logger.info(f"Reached end of TVMaze index at page {page}")
+                    break  # End of pages
+
+                logger.info(f"Processing page {page} ({len(shows_data)} shows)")
+
+                # One timestamp per page - sub-second precision is irrelevant for scheduling
+                now = datetime.now(UTC)
+                retry_after = now + retry_delay
+
+                for show_data in shows_data:
+                    try:
+                        show = Show.from_tvmaze_response(show_data)
+                        process_single_show(db, config, sonarr, processor, show, stats, now, retry_after)
+                        state.highest_tvmaze_id = max(state.highest_tvmaze_id, show.tvmaze_id)
+                    except Exception as e:
+                        logger.error("Error processing show %s: %s", show_data.get('id'), e)
+                        continue
+
+                # Checkpoint progress
+                state.last_tvmaze_page = page
+                if (
+                    page - last_checkpoint_page >= CHECKPOINT_INTERVAL_PAGES
+                    or time.monotonic() - last_checkpoint_time >= CHECKPOINT_INTERVAL_SECONDS
+                ):
+                    state.save(state_path)
+                    last_checkpoint_page = page
+                    last_checkpoint_time = time.monotonic()
+
+                page += 1
+
+            except TVMazeRateLimitError:
+                logger.warning("Rate limited, backing off...")
+                time.sleep(10)
+                continue
+    finally:
+        # Always persist the latest completed page, including on error
+        state.save(state_path)
 
     logger.info(f"Initial sync complete, processed {stats.shows_processed} shows")
 
@@ -386,6 +446,10 @@ def run_incremental_sync(db, state, config, sonarr, tvmaze, processor, stats):
         updates = tvmaze.get_updates(since=config.tvmaze.update_window)
         logger.info(f"Found {len(updates)} updated shows")
 
+        # One timestamp for the whole update batch
+        now = datetime.now(UTC)
+        retry_after = now + parse_duration(config.sync.retry_delay)
+
         for tvmaze_id, updated_at in updates.items():
             existing = db.get_show(tvmaze_id)
 
@@ -394,15 +458,15 @@ def run_incremental_sync(db, state, config, sonarr, tvmaze, processor, stats):
                 try:
                     show_data = tvmaze.get_show(tvmaze_id)
                     show = Show.from_tvmaze_response(show_data)
-                    process_single_show(db, config, sonarr, processor, show, stats)
+                    process_single_show(db, config, sonarr, processor, show, stats, now, retry_after)
                     state.highest_tvmaze_id = max(state.highest_tvmaze_id, tvmaze_id)
                 except TVMazeNotFoundError:
-                    logger.warning(f"Show {tvmaze_id} not found, skipping")
+                    logger.warning("Show %s not found, skipping", tvmaze_id)
                 except TVMazeRateLimitError:
                     logger.warning("Rate limited, backing off...")
                     time.sleep(10)
                 except Exception as e:
-                    logger.error(f"Error processing show {tvmaze_id}: {e}")
+                    logger.error("Error processing show %s: %s", tvmaze_id, e)
 
         # Check for new shows beyond highest known ID
         check_for_new_shows(db, state, config, sonarr, tvmaze, processor, stats)
@@ -421,11 +485,14 @@ def check_for_new_shows(db, state, config, sonarr, tvmaze, processor, stats):
 
     logger.info(f"Checking for new shows above ID {state.highest_tvmaze_id}")
 
+    now = datetime.now(UTC)
+    retry_after = now + parse_duration(config.sync.retry_delay)
+
     while consecutive_not_found < max_not_found:
         try:
             show_data = tvmaze.get_show(current_id)
             show = Show.from_tvmaze_response(show_data)
-            process_single_show(db, config, sonarr, processor, show, stats)
+            process_single_show(db, config, sonarr, processor, show, stats, now, retry_after)
             state.highest_tvmaze_id = max(state.highest_tvmaze_id, current_id)
             consecutive_not_found = 0
             current_id += 1
@@ -436,7 +503,7 @@ def check_for_new_shows(db, state, config, sonarr, tvmaze, processor, stats):
             logger.warning("Rate limited, backing off...")
             time.sleep(10)
         except Exception as e:
-            logger.error(f"Error checking show {current_id}: {e}")
+            logger.error("Error checking show %s: %s", current_id, e)
             consecutive_not_found += 1
             current_id += 1
 
@@ -447,12 +514,14 @@ def retry_pending_tvdb(db, state, config, sonarr, tvmaze, processor, stats):
     """Retry shows pending TVDB ID."""
     now = datetime.now(UTC)
     abandon_after = parse_duration(config.sync.abandon_after)
+    retry_after = now + parse_duration(config.sync.retry_delay)
 
     # First, mark shows that have exceeded abandon_after as failed
     shows_to_abandon = db.get_shows_to_abandon(now, abandon_after)
     for show in shows_to_abandon:
         logger.warning(
-            f"Show {show.title} exceeded abandon_after ({config.sync.abandon_after}), marking as failed"
+            "Show %s exceeded abandon_after (%s), marking as failed",
+            show.title, config.sync.abandon_after
         )
         db.mark_show_failed(show.tvmaze_id, f"No TVDB ID after {config.sync.abandon_after}")
 
@@ -478,28 +547,32 @@ def retry_pending_tvdb(db, state, config, sonarr, tvmaze, processor, stats):
 
             # Process again
             if updated_show.tvdb_id:
-                logger.info(f"Show {show.title} now has TVDB ID, processing")
+                logger.info("Show %s now has TVDB ID, processing", show.title)
                 db.increment_retry_count(show.tvmaze_id)
-                process_single_show(db, config, sonarr, processor, updated_show, stats)
+                process_single_show(db, config, sonarr, processor, updated_show, stats, now, retry_after)
             else:
                 # Still no TVDB ID - schedule next retry
                 db.increment_retry_count(show.tvmaze_id)
-                retry_after = now + parse_duration(config.sync.retry_delay)
                 db.mark_show_pending_tvdb(show.tvmaze_id, retry_after, now)
 
         except TVMazeNotFoundError:
-            logger.warning(f"Show {show.tvmaze_id} no longer exists on TVMaze")
+            logger.warning("Show %s no longer exists on TVMaze", show.tvmaze_id)
             db.mark_show_failed(show.tvmaze_id, "Removed from TVMaze")
         except Exception as e:
-            logger.error(f"Error retrying show {show.title}: {e}")
+            logger.error("Error retrying show %s: %s", show.title, e)
+
 
+def process_single_show(db, config, sonarr, processor, show, stats, now, retry_after):
+    """Process a single show through filters and Sonarr.
+
+    ``now`` and ``retry_after`` are computed once per batch by the caller so
+    the clock and retry_delay are not re-read for every show.
+    """
 
-def process_single_show(db, config, sonarr, processor, show, stats):
-    """Process a single show through filters and Sonarr."""
     stats.shows_processed += 1
 
     # Store show in database
-    show.last_checked = datetime.now(UTC)
+    show.last_checked = now
     db.upsert_show(show)
 
     # Process through filters
@@ -509,44 +582,40 @@ def process_single_show(db, config, sonarr, processor, show, stats):
         db.mark_show_filtered(show.tvmaze_id, result.reason, result.filter_category)
         stats.shows_filtered += 1
         if config.dry_run:
-            logger.info(f"[DRY RUN] Filtered: {show.title} - {result.reason}")
+            logger.info("[DRY RUN] Filtered: %s - %s", show.title, result.reason)
 
     elif result.decision == Decision.RETRY:
-        retry_after = datetime.now(UTC) + parse_duration(config.sync.retry_delay)
-        db.mark_show_pending_tvdb(show.tvmaze_id, retry_after)
+        db.mark_show_pending_tvdb(show.tvmaze_id, retry_after, now)
         stats.shows_skipped += 1
         if config.dry_run:
-            logger.info(f"[DRY RUN] Pending TVDB: {show.title}")
+            logger.info("[DRY RUN] Pending TVDB: %s", show.title)
 
     elif result.decision == Decision.ADD:
         if config.dry_run:
             # In dry run, mark as "would add" but don't call Sonarr
-            logger.info(f"[DRY RUN] Would add: {show.title} (matched: {result.reason})")
+            logger.info("[DRY RUN] Would add: %s (matched: %s)", show.title, result.reason)
             stats.shows_added += 1
             return
 
         # Lookup and add to Sonarr
-        series_data = sonarr.lookup_series(show.tvdb_id)
-        if not series_data:
-            logger.warning(f"Cannot find {show.title} in Sonarr, marking as pending TVDB")
-            retry_after = datetime.now(UTC) + parse_duration(config.sync.retry_delay)
-            db.mark_show_pending_tvdb(show.tvmaze_id, retry_after)
+        add_result = add_to_sonarr(sonarr, show, result)
+        if add_result is None:
+            logger.warning("Cannot find %s in Sonarr, marking as pending TVDB", show.title)
+            db.mark_show_pending_tvdb(show.tvmaze_id, retry_after, now)
             stats.shows_skipped += 1
             return
 
-        add_result = sonarr.add_series(result.sonarr_params, series_data)
-
         if add_result.success:
             db.mark_show_added(show.tvmaze_id, add_result.series_id)
             stats.shows_added += 1
-            logger.info(f"Added: {show.title}")
+            logger.info("Added: %s", show.title)
         elif add_result.exists:
             db.update_show_status(show.tvmaze_id, ProcessingStatus.EXISTS)
             stats.shows_exists += 1
         else:
             db.mark_show_failed(show.tvmaze_id, add_result.error)
             stats.shows_failed += 1
-            logger.warning(f"Failed to add {show.title}: {add_result.error}")
+            logger.warning("Failed to add %s: %s", show.title, add_result.error)
 
 
 if __name__ == "__main__":
@@ -1,11 +1,75 @@
 """Data structures and type definitions for TVMaze-Sync."""
 
-import json
 import sqlite3
+import sys
 from dataclasses import dataclass, field
 from datetime import UTC, date, datetime
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Optional
+
+from . import jsonutil
+
+
+# Date strings repeat heavily across a batch (shared premiere/end dates, and
+# sync timestamps written once per page), so parsed values are memoised.
+@lru_cache(maxsize=4096)
+def _date_from_iso(value: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _datetime_from_iso(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """Parse an ISO date string, returning None if missing or invalid."""
+    # ISO values always start with the year; anything else can't parse
+    if not value or not isinstance(value, str) or not value[0].isdigit():
+        return None
+    return _date_from_iso(value)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO datetime string, returning None if missing or invalid."""
+    # ISO values always start with the year; anything else can't parse
+    if not value or not isinstance(value, str) or not value[0].isdigit():
+        return None
+    return _datetime_from_iso(value)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """
+    Intern a low-cardinality string (language, type, status, ...).
+
+    Repeats across thousands of shows then share one object, and filter set
+    probes against interned config values hit the identity fast path.
+    """
+    return sys.intern(value) if value.__class__ is str else value
+
+
+def _parse_genres(value: Optional[str]) -> list[str]:
+    """Parse the stored JSON genre list, returning [] if missing or invalid."""
+    if not value:
+        return []
+    try:
+        return jsonutil.loads(value)
+    except jsonutil.JSONDecodeError:
+        return []
+
+
+# Columns the filters read, in the order Show.from_filter_rows unpacks them
+FILTER_COLUMNS = (
+    "tvmaze_id", "tvdb_id", "title", "language", "country", "type", "status",
+    "premiered", "ended", "network", "genres", "runtime", "rating", "filter_reason",
+)
 
 
 class ProcessingStatus:
@@ -29,7 +93,7 @@ class Decision(Enum):
     RETRY = "retry"
 
 
-@dataclass
+@dataclass(slots=True)
 class Show:
     """TV show metadata from TVMaze."""
 
@@ -60,7 +124,8 @@ class Show:
     added_to_sonarr_at: Optional[datetime] = None
 
     # Sync metadata
-    last_checked: datetime = field(default_factory=lambda: datetime.now(UTC))
+    # Stamped by the sync loop; unset shows are stamped when first written
+    last_checked: Optional[datetime] = None
     tvmaze_updated_at: Optional[int] = None  # Unix timestamp
     retry_after: Optional[datetime] = None
     retry_count: int = 0
@@ -69,145 +134,127 @@ class Show:
 
     @classmethod
     def from_tvmaze_response(cls, data: dict) -> "Show":
-        """Parse TVMaze API response into Show object."""
+        """
+        Parse TVMaze API response into Show object.
+
+        Reads each key from the decoded response exactly once - this runs for
+        every show in the index during initial sync.
+        """
+        get = data.get
+
         # Extract external IDs
-        externals = data.get("externals", {})
-        tvdb_id = externals.get("thetvdb")
-        imdb_id = externals.get("imdb")
+        externals = get("externals") or {}
 
         # Extract country from network or web channel
         country = None
-        network_data = data.get("network")
-        web_channel_data = data.get("webChannel")
+        network_data = get("network")
+        web_channel_data = get("webChannel")
 
         if network_data and network_data.get("country"):
             country = network_data["country"].get("code")
         elif web_channel_data and web_channel_data.get("country"):
             country = web_channel_data["country"].get("code")
 
-        # Parse dates
-        premiered = None
-        if data.get("premiered"):
-            try:
-                premiered = date.fromisoformat(data["premiered"])
-            except (ValueError, TypeError):
-                pass
-
-        ended = None
-        if data.get("ended"):
-            try:
-                ended = date.fromisoformat(data["ended"])
-            except (ValueError, TypeError):
-                pass
-
         # Extract rating
-        rating_data = data.get("rating", {})
+        rating_data = get("rating")
         rating = rating_data.get("average") if rating_data else None
 
         return cls(
             tvmaze_id=data["id"],
-            tvdb_id=tvdb_id,
-            imdb_id=imdb_id,
-            title=data.get("name", "Unknown"),
-            language=data.get("language"),
-            country=country,
-            type=data.get("type"),
-            status=data.get("status"),
-            premiered=premiered,
-            ended=ended,
-            network=network_data.get("name") if network_data else None,
+            tvdb_id=externals.get("thetvdb"),
+            imdb_id=externals.get("imdb"),
+            title=get("name", "Unknown"),
+            language=_intern(get("language")),
+            country=_intern(country),
+            type=_intern(get("type")),
+            status=_intern(get("status")),
+            premiered=_parse_date(get("premiered")),
+            ended=_parse_date(get("ended")),
+            network=_intern(network_data.get("name")) if network_data else None,
             web_channel=web_channel_data.get("name") if web_channel_data else None,
-            genres=data.get("genres", []),
-            runtime=data.get("runtime"),
+            genres=get("genres", []),
+            runtime=get("runtime"),
             rating=rating,
-            tvmaze_updated_at=data.get("updated"),
+            tvmaze_updated_at=get("updated"),
         )
 
     @classmethod
-    def from_db_row(cls, row: sqlite3.Row) -> "Show":
-        """Parse SQLite row into Show object."""
-        # Parse genres from JSON string
-        genres = []
-        if row["genres"]:
-            try:
-                genres = json.loads(row["genres"])
-            except json.JSONDecodeError:
-                pass
-
-        # Parse dates
-        premiered = None
-        if row["premiered"]:
-            try:
-                premiered = date.fromisoformat(row["premiered"])
-            except (ValueError, TypeError):
-                pass
-
-        ended = None
-        if row["ended"]:
-            try:
-                ended = date.fromisoformat(row["ended"])
-            except (ValueError, TypeError):
-                pass
-
-        # Parse datetimes
-        last_checked = None
-        if row["last_checked"]:
-            try:
-                last_checked = datetime.fromisoformat(row["last_checked"])
-            except (ValueError, TypeError):
-                pass
-
-        added_to_sonarr_at = None
-        if row["added_to_sonarr_at"]:
-            try:
-                added_to_sonarr_at = datetime.fromisoformat(row["added_to_sonarr_at"])
-            except (ValueError, TypeError):
-                pass
-
-        retry_after = None
-        if row["retry_after"]:
-            try:
-                retry_after = datetime.fromisoformat(row["retry_after"])
-            except (ValueError, TypeError):
-                pass
-
-        pending_since = None
-        if row["pending_since"]:
-            try:
-                pending_since = datetime.fromisoformat(row["pending_since"])
-            except (ValueError, TypeError):
-                pass
+    def from_db_rows(cls, rows: Iterable[sqlite3.Row]) -> Iterator["Show"]:
+        """
+        Parse SQLite rows into Show objects.
+
+        Bulk loader for multi-row queries: column names are read once and each
+        row is converted to a dict in C, which makes the per-field lookups in
+        from_db_row hash lookups instead of sqlite3.Row name scans.
+        """
+        keys = None
+        for row in rows:
+            if keys is None:
+                keys = row.keys()
+            yield cls.from_db_row(dict(zip(keys, row)))
+
+    @classmethod
+    def from_filter_rows(cls, rows: Iterable[sqlite3.Row]) -> Iterator["Show"]:
+        """
+        Parse rows selecting FILTER_COLUMNS into Shows carrying only filter inputs.
+
+        Used for filter re-evaluation, which never reads sync or Sonarr state.
+        Rows are unpacked positionally, so no column-name lookups are needed.
+        """
+        for (tvmaze_id, tvdb_id, title, language, country, show_type, status,
+             premiered, ended, network, genres, runtime, rating, filter_reason) in rows:
+            yield cls(
+                tvmaze_id=tvmaze_id,
+                title=title,
+                tvdb_id=tvdb_id,
+                language=_intern(language),
+                country=_intern(country),
+                type=_intern(show_type),
+                status=_intern(status),
+                premiered=_parse_date(premiered),
+                ended=_parse_date(ended),
+                network=_intern(network),
+                genres=_parse_genres(genres),
+                runtime=runtime,
+                rating=rating,
+                processing_status=ProcessingStatus.FILTERED,
+                filter_reason=filter_reason,
+            )
 
+    @classmethod
+    def from_db_row(cls, row: sqlite3.Row | dict) -> "Show":
+        """Parse SQLite row (or a column-name mapping of one) into Show object."""
         return cls(
             tvmaze_id=row["tvmaze_id"],
             tvdb_id=row["tvdb_id"],
             imdb_id=row["imdb_id"],
             title=row["title"],
-            language=row["language"],
-            country=row["country"],
-            type=row["type"],
-            status=row["status"],
-            premiered=premiered,
-            ended=ended,
-            network=row["network"],
+            language=_intern(row["language"]),
+            country=_intern(row["country"]),
+            type=_intern(row["type"]),
+            status=_intern(row["status"]),
+            premiered=_parse_date(row["premiered"]),
+            ended=_parse_date(row["ended"]),
+            network=_intern(row["network"]),
             web_channel=row["web_channel"],
-            genres=genres,
+            genres=_parse_genres(row["genres"]),
             runtime=row["runtime"],
             rating=row["rating"],
             processing_status=row["processing_status"],
             filter_reason=row["filter_reason"],
             sonarr_series_id=row["sonarr_series_id"],
-            added_to_sonarr_at=added_to_sonarr_at,
-            last_checked=last_checked,
+            added_to_sonarr_at=_parse_datetime(row["added_to_sonarr_at"]),
+            last_checked=_parse_datetime(row["last_checked"]),
             tvmaze_updated_at=row["tvmaze_updated_at"],
-            retry_after=retry_after,
+            retry_after=_parse_datetime(row["retry_after"]),
             retry_count=row["retry_count"] or 0,
-            pending_since=pending_since,
+            pending_since=_parse_datetime(row["pending_since"]),
             error_message=row["error_message"],
         )
 
-    def to_db_dict(self) -> dict:
-        """Convert to dictionary for SQLite insert/update."""
+    def _base_payload(self) -> dict:
+        """Fields shared by the DB row and the JSON representation."""
+        added_to_sonarr_at = self.added_to_sonarr_at
         return {
             "tvmaze_id": self.tvmaze_id,
             "tvdb_id": self.tvdb_id,
@@ -221,47 +268,33 @@ class Show:
             "ended": self.ended.isoformat() if self.ended else None,
             "network": self.network,
             "web_channel": self.web_channel,
-            "genres": json.dumps(self.genres) if self.genres else None,
+            "genres": self.genres,
             "runtime": self.runtime,
             "rating": self.rating,
             "processing_status": self.processing_status,
             "filter_reason": self.filter_reason,
             "sonarr_series_id": self.sonarr_series_id,
-            "added_to_sonarr_at": self.added_to_sonarr_at.isoformat() if self.added_to_sonarr_at else None,
-            "last_checked": self.last_checked.isoformat() if self.last_checked else None,
-            "tvmaze_updated_at": self.tvmaze_updated_at,
-            "retry_after": self.retry_after.isoformat() if self.retry_after else None,
-            "retry_count": self.retry_count,
-            "pending_since": self.pending_since.isoformat() if self.pending_since else None,
-            "error_message": self.error_message,
+            "added_to_sonarr_at": added_to_sonarr_at.isoformat() if added_to_sonarr_at else None,
         }
 
+    def to_db_dict(self) -> dict:
+        """Convert to dictionary for SQLite insert/update."""
+        payload = self._base_payload()
+        payload["genres"] = jsonutil.dumps(self.genres).decode() if self.genres else None
+        payload["last_checked"] = (self.last_checked or datetime.now(UTC)).isoformat()
+        payload["tvmaze_updated_at"] = self.tvmaze_updated_at
+        payload["retry_after"] = self.retry_after.isoformat() if self.retry_after else None
+        payload["retry_count"] = self.retry_count
+        payload["pending_since"] = self.pending_since.isoformat() if self.pending_since else None
+        payload["error_message"] = self.error_message
+        return payload
+
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        return {
-            "tvmaze_id": self.tvmaze_id,
-            "tvdb_id": self.tvdb_id,
-            "imdb_id": self.imdb_id,
-            "title": self.title,
-            "language": self.language,
-            "country": self.country,
-            "type": self.type,
-            "status": self.status,
-            "premiered": self.premiered.isoformat() if self.premiered else None,
-            "ended": self.ended.isoformat() if self.ended else None,
-            "network": self.network,
-            "web_channel": self.web_channel,
-            "genres": self.genres,
-            "runtime": self.runtime,
-            "rating": self.rating,
-            "processing_status": self.processing_status,
-            "filter_reason": self.filter_reason,
-            "sonarr_series_id": self.sonarr_series_id,
-            "added_to_sonarr_at": self.added_to_sonarr_at.isoformat() if self.added_to_sonarr_at else None,
-        }
+        return self._base_payload()
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """Result of processing a show through filters."""
 
@@ -271,7 +304,7 @@ class ProcessingResult:
     sonarr_params: Optional["SonarrParams"] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SonarrParams:
     """Parameters for Sonarr add_series call."""
 
@@ -285,7 +318,7 @@ class SonarrParams:
     tags: list[int] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncStats:
     """Statistics from a sync cycle."""
 
@@ -1,18 +1,22 @@
 """Show filtering and processing logic."""
 
 import hashlib
-import json
 import logging
-from datetime import date
-from typing import Optional
+import sys
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Iterator, Optional
 
-from .config import FiltersConfig, Selection, SonarrConfig
+from . import jsonutil
+from .config import FiltersConfig, GlobalExclude, Selection, SonarrConfig
 from .database import Database
-from .models import Decision, ProcessingResult, ProcessingStatus, Show, SonarrParams
+from .models import Decision, ProcessingResult, Show, SonarrParams
 from .state import SyncState
 
 logger = logging.getLogger(__name__)
 
+# Selection predicates are re-sorted by observed rejection rate this often
+SELECTIVITY_REORDER_INTERVAL = 1000
+
 
 class ShowProcessor:
     """
@@ -29,6 +33,11 @@ class ShowProcessor:
         self.config = config
         self.sonarr_config = sonarr_config
         self._validated_sonarr_params: Optional[dict] = None
+        self._sonarr_fixed_params: Optional[tuple] = None
+
+        # Filters are frozen, so compile them once instead of per show
+        self._exclude_checks = _compile_exclude(config.exclude)
+        self._selections = [_SelectionMatcher(sel) for sel in config.selections]
 
     def set_validated_sonarr_params(
         self,
@@ -45,11 +54,23 @@ class ShowProcessor:
             'tag_ids': tag_ids,
         }
 
-    def process(self, show: Show) -> ProcessingResult:
+        # Everything after tvdb_id/title is fixed, so resolve it once. Kept in
+        # SonarrParams field order for positional construction per show.
+        self._sonarr_fixed_params = (
+            root_folder,
+            quality_profile_id,
+            language_profile_id,
+            self.sonarr_config.monitor,
+            self.sonarr_config.search_on_add,
+            tag_ids,
+        )
+
+    def process(self, show: Show, build_sonarr_params: bool = True) -> ProcessingResult:
         """
         Evaluate show against global excludes and selections.
 
-        Returns ProcessingResult with decision and details.
+        Returns ProcessingResult with decision and details. Decision-only
+        callers pass build_sonarr_params=False to skip SonarrParams on ADD.
         """
         # 1. Check TVDB ID first
         if show.tvdb_id is None:
@@ -59,17 +80,19 @@ class ShowProcessor:
                 filter_category="tvdb"
             )
 
-        # 2. Check global excludes
-        exclude_reason = self._matches_exclude(show)
-        if exclude_reason:
-            return ProcessingResult(
-                decision=Decision.FILTER,
-                reason=exclude_reason,
-                filter_category="exclude"
-            )
+        # 2. Check global excludes (compiled checks, inlined - runs per show)
+        for check in self._exclude_checks:
+            exclude_reason = check(show)
+            if exclude_reason:
+                return ProcessingResult(
+                    decision=Decision.FILTER,
+                    reason=exclude_reason,
+                    filter_category="exclude"
+                )
 
         # 3. Check selections - at least one must be defined
-        if not self.config.selections:
+        selections = self._selections
+        if not selections:
             return ProcessingResult(
                 decision=Decision.FILTER,
                 reason="No selections configured",
@@ -77,13 +100,13 @@ class ShowProcessor:
             )
 
         # 4. Check if show matches any selection (OR logic)
-        for selection in self.config.selections:
-            if self._matches_selection(show, selection):
-                sonarr_params = self._build_sonarr_params(show)
+        for matcher in selections:
+            if matcher.matches(show):
+                selection = matcher.selection
                 return ProcessingResult(
                     decision=Decision.ADD,
                     reason=f"Matched: {selection.name or 'unnamed selection'}",
-                    sonarr_params=sonarr_params
+                    sonarr_params=self._build_sonarr_params(show) if build_sonarr_params else None
                 )
 
         # 5. No selection matched
@@ -93,128 +116,193 @@ class ShowProcessor:
             filter_category="selection"
         )
 
-    def _matches_exclude(self, show: Show) -> Optional[str]:
+    def process_many(
+        self,
+        shows: Iterable[Show],
+        build_sonarr_params: bool = True
+    ) -> Iterator[tuple[Show, ProcessingResult]]:
         """
-        Check if show matches any global exclude criteria.
+        Evaluate shows in bulk, yielding (show, result) pairs.
 
-        Returns reason string if excluded, None if not excluded.
+        Callers that only need the decision (filter re-evaluation) pass
+        build_sonarr_params=False so ADD results skip building SonarrParams.
         """
-        exc = self.config.exclude
+        process = self.process
+        for show in shows:
+            yield show, process(show, build_sonarr_params)
 
-        # Check genres
-        if exc.genres and show.genres:
-            overlap = set(exc.genres) & set(show.genres)
-            if overlap:
-                return f"Excluded genre: {', '.join(sorted(overlap))}"
-
-        # Check types
-        if exc.types and show.type in exc.types:
-            return f"Excluded type: {show.type}"
+    def _build_sonarr_params(self, show: Show) -> SonarrParams:
+        """Build Sonarr parameters for show addition."""
+        if self._sonarr_fixed_params is None:
+            raise RuntimeError("Sonarr parameters not validated. Call set_validated_sonarr_params() first.")
 
-        # Check languages
-        if exc.languages and show.language in exc.languages:
-            return f"Excluded language: {show.language}"
+        return SonarrParams(show.tvdb_id, show.title, *self._sonarr_fixed_params)
 
-        # Check countries
-        if exc.countries and show.country in exc.countries:
-            return f"Excluded country: {show.country}"
 
-        # Check networks
-        if exc.networks and show.network in exc.networks:
-            return f"Excluded network: {show.network}"
+class _SelectionMatcher:
+    """
+    A compiled selection that checks its most selective criteria first.
 
-        return None
+    All predicates must pass, so their order only affects cost. Rejections
+    are counted per predicate and every SELECTIVITY_REORDER_INTERVAL
+    evaluations the predicates are re-sorted so the ones that reject most
+    often run first. Counts are halved on each re-sort to follow drift.
+    """
 
-    def _matches_selection(self, show: Show, sel: Selection) -> bool:
-        """
-        Check if show matches ALL criteria in a selection.
+    __slots__ = ("selection", "predicates", "_rejections", "_evaluations")
 
-        Empty list/None for a criteria = no constraint (passes).
-        """
-        # Language filter
-        if sel.languages and show.language not in sel.languages:
-            return False
+    def __init__(self, selection: Selection):
+        self.selection = selection
+        self.predicates = _compile_selection(selection)
+        self._rejections = dict.fromkeys(self.predicates, 0)
+        self._evaluations = 0
 
-        # Country filter
-        if sel.countries and show.country not in sel.countries:
-            return False
+    def matches(self, show: Show) -> bool:
+        """Check if show satisfies ALL criteria of the selection."""
+        self._evaluations += 1
+        if self._evaluations >= SELECTIVITY_REORDER_INTERVAL:
+            self._reorder()
 
-        # Genre filter (show must have at least one matching genre)
-        if sel.genres:
-            show_genres = set(show.genres) if show.genres else set()
-            if not (set(sel.genres) & show_genres):
+        for predicate in self.predicates:
+            if not predicate(show):
+                self._rejections[predicate] += 1
                 return False
+        return True
 
-        # Type filter
-        if sel.types and show.type not in sel.types:
-            return False
+    def _reorder(self) -> None:
+        """Sort predicates by descending rejection count and decay counts."""
+        rejections = self._rejections
+        self.predicates = tuple(sorted(self.predicates, key=rejections.__getitem__, reverse=True))
+        for predicate in rejections:
+            rejections[predicate] //= 2
+        self._evaluations = 0
 
-        # Network filter
-        if sel.networks and show.network not in sel.networks:
-            return False
 
-        # Status filter
-        if sel.status and show.status not in sel.status:
-            return False
+def _compile_exclude(exc: GlobalExclude) -> tuple[Callable[[Show], Optional[str]], ...]:
+    """
+    Compile global excludes into checks, one per configured criteria.
+
+    Unconfigured criteria get no check at all. Each check returns the
+    exclusion reason, or None if the show passes it. Order matches the
+    reported reason precedence: genre, type, language, country, network.
+    """
+    checks: list[Callable[[Show], Optional[str]]] = []
+
+    if exc.genres:
+        genres = frozenset(exc.genres)
+
+        def check_genres(show: Show) -> Optional[str]:
+            # isdisjoint short-circuits without building a set; most shows pass
+            if show.genres and not genres.isdisjoint(show.genres):
+                return f"Excluded genre: {', '.join(sorted(genres.intersection(show.genres)))}"
+            return None
+
+        checks.append(check_genres)
 
-        # Premiered date range
-        if sel.premiered:
-            if sel.premiered.after:
-                threshold = date.fromisoformat(sel.premiered.after)
-                if not show.premiered or show.premiered < threshold:
-                    return False
-            if sel.premiered.before:
-                threshold = date.fromisoformat(sel.premiered.before)
-                if not show.premiered or show.premiered > threshold:
-                    return False
-
-        # Ended date range
-        if sel.ended:
-            if sel.ended.after:
-                threshold = date.fromisoformat(sel.ended.after)
-                if not show.ended or show.ended < threshold:
-                    return False
-            if sel.ended.before:
-                threshold = date.fromisoformat(sel.ended.before)
-                if not show.ended or show.ended > threshold:
-                    return False
-
-        # Rating range
-        if sel.rating:
-            show_rating = getattr(show, 'rating', None)
-            if sel.rating.min is not None:
-                if show_rating is None or show_rating < sel.rating.min:
-                    return False
-            if sel.rating.max is not None:
-                if show_rating is None or show_rating > sel.rating.max:
-                    return False
-
-        # Runtime range
-        if sel.runtime:
-            if sel.runtime.min is not None:
-                if show.runtime is None or show.runtime < sel.runtime.min:
-                    return False
-            if sel.runtime.max is not None:
-                if show.runtime is None or show.runtime > sel.runtime.max:
-                    return False
+    if exc.types:
+        checks.append(_excluded_by("type", exc.types))
+    if exc.languages:
+        checks.append(_excluded_by("language", exc.languages))
+    if exc.countries:
+        checks.append(_excluded_by("country", exc.countries))
+    if exc.networks:
+        checks.append(_excluded_by("network", exc.networks))
 
+    return tuple(checks)
+
+
+def _excluded_by(attr: str, values: list) -> Callable[[Show], Optional[str]]:
+    """Check: show attribute is one of the excluded values."""
+    get = attrgetter(attr)
+    excluded = _interned_set(values)
+
+    def check(show: Show) -> Optional[str]:
+        value = get(show)
+        return f"Excluded {attr}: {value}" if value in excluded else None
+
+    return check
+
+
+def _compile_selection(sel: Selection) -> tuple[Callable[[Show], bool], ...]:
+    """
+    Compile a selection into predicates, one per constrained criteria.
+
+    Empty list/None for a criteria = no constraint, so no predicate is built.
+    A show matches the selection when every predicate returns True.
+    """
+    predicates: list[Callable[[Show], bool]] = []
+
+    if sel.languages:
+        predicates.append(_member_of("language", sel.languages))
+    if sel.countries:
+        predicates.append(_member_of("country", sel.countries))
+
+    # Show must have at least one matching genre
+    if sel.genres:
+        genres = frozenset(sel.genres)
+        predicates.append(lambda show: bool(show.genres) and not genres.isdisjoint(show.genres))
+
+    if sel.types:
+        predicates.append(_member_of("type", sel.types))
+    if sel.networks:
+        predicates.append(_member_of("network", sel.networks))
+    if sel.status:
+        predicates.append(_member_of("status", sel.status))
+
+    if sel.premiered:
+        _append_range(predicates, "premiered", sel.premiered.after_date, sel.premiered.before_date)
+    if sel.ended:
+        _append_range(predicates, "ended", sel.ended.after_date, sel.ended.before_date)
+    if sel.rating:
+        _append_range(predicates, "rating", sel.rating.min, sel.rating.max)
+    if sel.runtime:
+        _append_range(predicates, "runtime", sel.runtime.min, sel.runtime.max)
+
+    return tuple(predicates)
+
+
+def _member_of(attr: str, values: list) -> Callable[[Show], bool]:
+    """Predicate: show attribute is one of values."""
+    get = attrgetter(attr)
+    allowed = _interned_set(values)
+    return lambda show: get(show) in allowed
+
+
+def _interned_set(values: list) -> frozenset:
+    """Frozenset of config values, interned to match categorical Show fields."""
+    return frozenset(sys.intern(value) if isinstance(value, str) else value for value in values)
+
+
+def _append_range(
+    predicates: list[Callable[[Show], bool]],
+    attr: str,
+    low: Any,
+    high: Any
+) -> None:
+    """Append an inclusive range predicate; a missing value never matches."""
+    if low is None and high is None:
+        return
+
+    get = attrgetter(attr)
+
+    def in_range(show: Show) -> bool:
+        value = get(show)
+        if value is None:
+            return False
+        if low is not None and value < low:
+            return False
+        if high is not None and value > high:
+            return False
         return True
 
-    def _build_sonarr_params(self, show: Show) -> SonarrParams:
-        """Build Sonarr parameters for show addition."""
-        if not self._validated_sonarr_params:
-            raise RuntimeError("Sonarr parameters not validated. Call set_validated_sonarr_params() first.")
+    predicates.append(in_range)
 
-        return SonarrParams(
-            tvdb_id=show.tvdb_id,
-            title=show.title,
-            root_folder=self._validated_sonarr_params['root_folder'],
-            quality_profile_id=self._validated_sonarr_params['quality_profile_id'],
-            language_profile_id=self._validated_sonarr_params.get('language_profile_id'),
-            monitor=self.sonarr_config.monitor,
-            search_on_add=self.sonarr_config.search_on_add,
-            tags=self._validated_sonarr_params.get('tag_ids', [])
-        )
+
+# Filter hashes keyed by config identity. FiltersConfig is frozen but holds
+# lists, so it is not hashable; the config is kept alongside its hash so the
+# id cannot be reused by another object while the entry is cached.
+_FILTER_HASH_CACHE: dict[int, tuple[FiltersConfig, str]] = {}
+_FILTER_HASH_CACHE_SIZE = 8
 
 
 def compute_filter_hash(config: FiltersConfig) -> str:
@@ -222,53 +310,43 @@ def compute_filter_hash(config: FiltersConfig) -> str:
     Compute hash of filter configuration.
 
     Used to detect filter changes between runs.
-    Returns 16-character hex string.
+    Returns 16-character hex string. Results are cached per config object.
     """
-    # Build hashable representation of config
-    exclude_dict = {
-        "genres": sorted(config.exclude.genres),
-        "types": sorted(config.exclude.types),
-        "languages": sorted(config.exclude.languages),
-        "countries": sorted(config.exclude.countries),
-        "networks": sorted(config.exclude.networks),
-    }
-
-    selections_list = []
-    for sel in config.selections:
-        sel_dict = {
-            "name": sel.name,
-            "languages": sorted(sel.languages),
-            "countries": sorted(sel.countries),
-            "genres": sorted(sel.genres),
-            "types": sorted(sel.types),
-            "networks": sorted(sel.networks),
-            "status": sorted(sel.status),
-            "premiered": {
-                "after": sel.premiered.after if sel.premiered else None,
-                "before": sel.premiered.before if sel.premiered else None,
-            },
-            "ended": {
-                "after": sel.ended.after if sel.ended else None,
-                "before": sel.ended.before if sel.ended else None,
-            },
-            "rating": {
-                "min": sel.rating.min if sel.rating else None,
-                "max": sel.rating.max if sel.rating else None,
-            },
-            "runtime": {
-                "min": sel.runtime.min if sel.runtime else None,
-                "max": sel.runtime.max if sel.runtime else None,
-            },
-        }
-        selections_list.append(sel_dict)
+    cached = _FILTER_HASH_CACHE.get(id(config))
+    if cached is not None and cached[0] is config:
+        return cached[1]
+
+    filter_hash = _compute_filter_hash(config)
+
+    if len(_FILTER_HASH_CACHE) >= _FILTER_HASH_CACHE_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        del _FILTER_HASH_CACHE[next(iter(_FILTER_HASH_CACHE))]
+    _FILTER_HASH_CACHE[id(config)] = (config, filter_hash)
+
+    return filter_hash
+
 
-    filter_dict = {
-        "exclude": exclude_dict,
-        "selections": selections_list,
-    }
+def _compute_filter_hash(config: FiltersConfig) -> str:
+    """
+    Hash the canonical filter representation.
 
-    serialized = json.dumps(filter_dict, sort_keys=True)
-    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+    Sections are serialized one at a time and streamed into the hasher
+    instead of building one nested dict and a single large JSON buffer.
+    The bytes fed in are exactly the compact sorted-key JSON of
+    ``{"exclude": ..., "selections": [...]}``, so hashes stay stable.
+    """
+    dumps = jsonutil.dumps
+    # Non-cryptographic fingerprint: an 8-byte blake2b digest is exactly 16 hex chars
+    hasher = hashlib.blake2b(digest_size=8)
+    hasher.update(b'{"exclude":')
+    hasher.update(dumps(config.exclude.canonical, sort_keys=True))
+    hasher.update(b',"selections":[')
+    for index, sel in enumerate(config.selections):
+        if index:
+            hasher.update(b",")
+        hasher.update(dumps(sel.canonical, sort_keys=True))
+    hasher.update(b"]}")
+    return hasher.hexdigest()
 
 
 def check_filter_change(
@@ -299,27 +377,36 @@ def re_evaluate_filtered_shows(db: Database, processor: ShowProcessor) -> int:
     Re-evaluate all filtered shows against current filters.
 
     Shows that now pass filters are marked for Sonarr addition.
+    Status changes are collected while reading and written in one batch.
     Returns count of shows that changed status.
-    """
-    changed = 0
 
-    for show in db.get_all_filtered_shows():
-        result = processor.process(show)
+    Evaluation stays in-process: a filter check costs a few microseconds,
+    less than pickling the show to a worker process and back. Only the
+    columns filters read are loaded, and Sonarr parameters are not built.
+    """
+    now_pending: list[int] = []
+    passed_titles: list[str] = []
+    refiltered: list[tuple[int, str, str]] = []
+    results = processor.process_many(db.get_filtered_shows_for_evaluation(), build_sonarr_params=False)
 
+    for show, result in results:
         if result.decision == Decision.ADD:
             # Was filtered, now passes
-            db.update_show_status(show.tvmaze_id, ProcessingStatus.PENDING)
-            changed += 1
-            logger.info(f"Show now passes filters: {show.title}")
+            now_pending.append(show.tvmaze_id)
+            passed_titles.append(show.title)
         elif result.decision == Decision.FILTER:
-            # Still filtered, possibly different reason
-            if result.reason != show.filter_reason:
-                db.mark_show_filtered(
-                    show.tvmaze_id,
-                    result.reason,
-                    result.filter_category
-                )
-                logger.debug(f"Updated filter reason for {show.title}: {result.reason}")
+            # Still filtered, possibly different reason (stored as "category: reason")
+            if f"{result.filter_category}: {result.reason}" != show.filter_reason:
+                refiltered.append((show.tvmaze_id, result.reason, result.filter_category))
+
+    db.update_refiltered_shows(now_pending, refiltered)
+
+    # Logged once the batch has committed, so the log never reports unsaved changes
+    for title in passed_titles:
+        logger.info("Show now passes filters: %s", title)
+    if refiltered:
+        logger.debug("Updated filter reason for %d shows", len(refiltered))
 
+    changed = len(now_pending)
     logger.info(f"Re-evaluated filtered shows: {changed} now pass filters")
     return changed
@@ -2,6 +2,7 @@
 
 import logging
 import threading
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Callable, Optional
 
@@ -29,7 +30,8 @@ class Scheduler:
         self._stop_event = threading.Event()
         self._trigger_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
-        self._next_run: Optional[datetime] = None
+        # Deadline on the monotonic clock; converted to wall-clock on read
+        self._next_run_monotonic: Optional[float] = None
         self._running = False
         self._lock = threading.Lock()
 
@@ -72,7 +74,10 @@ class Scheduler:
     def next_run(self) -> Optional[datetime]:
         """Get next scheduled run time."""
         with self._lock:
-            return self._next_run
+            deadline = self._next_run_monotonic
+        if deadline is None:
+            return None
+        return datetime.now(UTC) + timedelta(seconds=deadline - time.monotonic())
 
     @property
     def is_running(self) -> bool:
@@ -85,47 +90,34 @@ class Scheduler:
         Safely log a message, handling closed stream errors.
 
         During shutdown (especially in tests), logging streams may be closed
-        before background threads stop. This method checks handler validity
-        and suppresses Python's logging error handler to prevent error messages
-        from polluting test output.
+        before background threads stop. Handler streams are only checked once
+        stop has been requested; while running, messages are logged directly.
         """
-        # Check if any handlers have valid (open) streams
-        has_valid_handler = False
+        if self._stop_event.is_set() and not self._has_open_handler():
+            return
+
+        try:
+            getattr(logger, level)(message, exc_info=exc_info)
+        except (ValueError, OSError):
+            # Stream closed during logging - ignore silently
+            pass
+
+    @staticmethod
+    def _has_open_handler() -> bool:
+        """Check if any handler can still accept records."""
         for handler in logger.handlers:
             if hasattr(handler, 'stream'):
                 try:
                     # Try to check if stream is closed
                     if not handler.stream.closed:
-                        has_valid_handler = True
-                        break
+                        return True
                 except (AttributeError, ValueError):
                     # Stream doesn't have 'closed' attribute or is invalid
                     continue
             else:
                 # Non-stream handlers (like NullHandler) are OK
-                has_valid_handler = True
-                break
-
-        # If no valid handlers, skip logging to avoid errors
-        if not has_valid_handler:
-            return
-
-        # Temporarily suppress logging's internal error handler
-        old_raise_exceptions = logging.raiseExceptions
-        logging.raiseExceptions = False
-
-        try:
-            log_func = getattr(logger, level)
-            if exc_info:
-                log_func(message, exc_info=True)
-            else:
-                log_func(message)
-        except (ValueError, OSError):
-            # Stream closed during logging - ignore silently
-            pass
-        finally:
-            # Restore original setting
-            logging.raiseExceptions = old_raise_exceptions
+                return True
+        return False
 
     def _run_loop(self) -> None:
         """Main scheduler loop."""
@@ -134,20 +126,26 @@ class Scheduler:
         with self._lock:
             self._running = True
 
+        interval_seconds = self.interval.total_seconds()
+        deadline = time.monotonic() + interval_seconds
+
         while not self._stop_event.is_set():
-            # Calculate next run time
             with self._lock:
-                self._next_run = datetime.now(UTC) + self.interval
+                self._next_run_monotonic = deadline
 
-            # Wait for interval or trigger
+            # Wait out the rest of the interval (or a trigger); a cycle that
+            # overran the interval leaves nothing to wait for
             triggered = self._trigger_event.wait(
-                timeout=self.interval.total_seconds()
+                timeout=max(0.0, deadline - time.monotonic())
             )
             self._trigger_event.clear()
 
             if self._stop_event.is_set():
                 break
 
+            # Next run is measured from the start of this cycle, not its end
+            deadline = time.monotonic() + interval_seconds
+
             if triggered:
                 self._safe_log("info", "Running sync cycle (manually triggered)")
             else:
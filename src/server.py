@@ -1,10 +1,15 @@
 """Flask HTTP server for health, metrics, and API."""
 
 import logging
+import threading
+import time
+from typing import Any, Iterable, Iterator, Optional
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from . import jsonutil
 from .config import Config
 from .database import Database
 from .metrics import update_db_metrics
@@ -13,6 +18,52 @@ from .state import SyncState
 
 logger = logging.getLogger(__name__)
 
+# Scrapes within this window share one DB refresh and serialized payload
+METRICS_CACHE_TTL_SECONDS = 2.0
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes with jsonutil (orjson) instead of stdlib json."""
+
+    # json.dumps options jsonutil can honour
+    _DUMPS_OPTIONS = frozenset({"sort_keys", "indent"})
+    # Formatting-only options (e.g. TaggedJSONSerializer passes separators);
+    # output is always compact UTF-8, so these are accepted and ignored
+    _IGNORED_DUMPS_OPTIONS = frozenset({"separators", "ensure_ascii"})
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        # Anything else (default, cls, ...) changes semantics, so reject it
+        unsupported = kwargs.keys() - self._DUMPS_OPTIONS - self._IGNORED_DUMPS_OPTIONS
+        if unsupported:
+            raise TypeError(f"Unsupported dumps() arguments: {', '.join(sorted(unsupported))}")
+        return self._encode(
+            obj,
+            sort_keys=bool(kwargs.get("sort_keys")),
+            indent=bool(kwargs.get("indent")),
+        ).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return jsonutil.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Same argument rules as jsonify(): one value, several (as a list), or kwargs
+        if args and kwargs:
+            raise TypeError("response() takes either args or kwargs, not both")
+        if len(args) == 1:
+            obj = args[0]
+        elif args:
+            obj = list(args)
+        else:
+            obj = kwargs or None
+
+        # Hand orjson's bytes straight to the response, skipping a decode/encode
+        return self._app.response_class(self._encode(obj), mimetype="application/json")
+
+    @staticmethod
+    def _encode(obj: Any, sort_keys: bool = False, indent: bool = False) -> bytes:
+        # Non-str dict keys are stringified, as with Flask's stdlib provider
+        return jsonutil.dumps(obj, sort_keys=sort_keys, indent=indent, non_str_keys=True)
+
 
 def create_app(
     db: Database,
@@ -25,6 +76,11 @@ def create_app(
     """Create Flask application."""
 
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    metrics_lock = threading.Lock()
+    metrics_body = b""
+    metrics_generated_at: Optional[float] = None
 
     @app.before_request
     def check_api_key():
@@ -68,8 +124,17 @@ def create_app(
     @app.route('/metrics')
     def metrics():
         """Prometheus metrics endpoint."""
-        update_db_metrics(db)
-        return generate_latest(), 200, {'Content-Type': CONTENT_TYPE_LATEST}
+        nonlocal metrics_body, metrics_generated_at
+
+        with metrics_lock:
+            now = time.monotonic()
+            if metrics_generated_at is None or now - metrics_generated_at >= METRICS_CACHE_TTL_SECONDS:
+                update_db_metrics(db)
+                metrics_body = generate_latest()
+                metrics_generated_at = now
+            body = metrics_body
+
+        return body, 200, {'Content-Type': CONTENT_TYPE_LATEST}
 
     @app.route('/trigger', methods=['POST'])
     def trigger():
@@ -112,6 +177,9 @@ def create_app(
         offset = request.args.get('offset', 0, type=int)
 
         if status:
+            # Materialized (capped at 1000) so no read cursor stays open on
+            # the shared connection while the body streams, and DB errors
+            # surface as a 500 rather than truncated JSON
             shows = db.get_shows_by_status(
                 status=status,
                 limit=min(limit, 1000),
@@ -121,7 +189,7 @@ def create_app(
             # If no status filter, limit results
             shows = []
 
-        return jsonify([s.to_dict() for s in shows])
+        return Response(_stream_json_array(s.to_dict() for s in shows), mimetype='application/json')
 
     @app.route('/refilter', methods=['POST'])
     def refilter():
@@ -145,3 +213,12 @@ def create_app(
         return jsonify(config.to_dict())
 
     return app
+
+
+def _stream_json_array(items: Iterable[dict]) -> Iterator[bytes]:
+    """Encode items as a JSON array one element per chunk."""
+    separator = b"["
+    for item in items:
+        yield separator + jsonutil.dumps(item)
+        separator = b","
+    yield b"]" if separator == b"," else b"[]"
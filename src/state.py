@@ -1,17 +1,44 @@
 """JSON operational state management with backup/restore."""
 
-import json
 import logging
+import os
+import re
 import shutil
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+from . import jsonutil
+
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# validate_state and SyncState.from_dict both parse the same timestamps on
+# load; memoise so each string is parsed once. Invalid input still raises.
+@lru_cache(maxsize=16)
+def _parse_datetime(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+# Cheap shape check so obviously corrupt values are rejected without
+# going through fromisoformat and exception handling
+_ISO_DATETIME_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+
+def _parse_state_datetime(value) -> Optional[datetime]:
+    """Parse a stored timestamp, returning None if it isn't a valid ISO datetime."""
+    if value.__class__ is not str or not _ISO_DATETIME_RE.match(value):
+        return None
+    try:
+        return _parse_datetime(value)
+    except ValueError:
+        # Right shape but out of range (e.g. month 13)
+        return None
+
+
+@dataclass(slots=True)
 class SyncState:
     """Operational state persisted between runs."""
 
@@ -22,6 +49,11 @@ class SyncState:
     last_filter_hash: Optional[str] = None
     last_updates_check: Optional[datetime] = None
 
+    # (path, bytes) of the last successful save, to skip identical rewrites
+    _last_saved: Optional[tuple[Path, bytes]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @classmethod
     def load(cls, path: Path) -> "SyncState":
         """
@@ -37,31 +69,29 @@ class SyncState:
         # Try loading primary state file
         if path.exists():
             try:
-                with open(path, 'r') as f:
-                    data = json.load(f)
+                data = jsonutil.loads(path.read_bytes())
 
                 if validate_state(data):
-                    logger.info(f"Loaded state from {path}")
+                    logger.info("Loaded state from %s", path)
                     return cls.from_dict(data)
                 else:
-                    logger.warning(f"State file {path} failed validation, trying backup")
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Failed to load state from {path}: {e}, trying backup")
+                    logger.warning("State file %s failed validation, trying backup", path)
+            except (jsonutil.JSONDecodeError, IOError) as e:
+                logger.warning("Failed to load state from %s: %s, trying backup", path, e)
 
         # Try loading backup
         backup_path = path.parent / f"{path.name}.bak"
         if backup_path.exists():
             try:
-                with open(backup_path, 'r') as f:
-                    data = json.load(f)
+                data = jsonutil.loads(backup_path.read_bytes())
 
                 if validate_state(data):
-                    logger.warning(f"Restored state from backup {backup_path}")
+                    logger.warning("Restored state from backup %s", backup_path)
                     return cls.from_dict(data)
                 else:
-                    logger.error(f"Backup state file {backup_path} also failed validation")
-            except (json.JSONDecodeError, IOError) as e:
-                logger.error(f"Failed to load backup state from {backup_path}: {e}")
+                    logger.error("Backup state file %s also failed validation", backup_path)
+            except (jsonutil.JSONDecodeError, IOError) as e:
+                logger.error("Failed to load backup state from %s: %s", backup_path, e)
 
         # Return fresh state if all else fails
         logger.warning("Starting with fresh state (no valid state file found)")
@@ -73,24 +103,37 @@ class SyncState:
 
         Process:
         1. Serialize to JSON
-        2. Write to state.json.tmp
-        3. Atomic rename to state.json
+        2. Skip if identical to the last save to this path (and file exists)
+        3. Write to state.json.tmp and fsync it (via an unnamed O_TMPFILE
+           where supported, so the .tmp name only appears once complete)
+        4. Atomic rename to state.json, then fsync the directory so the
+           rename itself is durable (otherwise a crash can leave an empty file)
         """
+        serialized = jsonutil.dumps(self.to_dict(), indent=True)
+        if self._last_saved == (path, serialized) and path.exists():
+            logger.debug("State unchanged, skipping write to %s", path)
+            return
+
         # Ensure parent directory exists
         path.parent.mkdir(parents=True, exist_ok=True)
 
         # Write to temporary file
         tmp_path = path.parent / f"{path.name}.tmp"
         try:
-            with open(tmp_path, 'w') as f:
-                json.dump(self.to_dict(), f, indent=2)
+            if not _link_tmpfile(serialized, tmp_path):
+                with open(tmp_path, 'wb') as f:
+                    f.write(serialized)
+                    f.flush()
+                    os.fsync(f.fileno())
 
             # Atomic rename
             tmp_path.replace(path)
-            logger.debug(f"Saved state to {path}")
+            _fsync_dir(path.parent)
+            self._last_saved = (path, serialized)
+            logger.debug("Saved state to %s", path)
 
         except IOError as e:
-            logger.error(f"Failed to save state to {path}: {e}")
+            logger.error("Failed to save state to %s: %s", path, e)
             if tmp_path.exists():
                 tmp_path.unlink()
             raise
@@ -99,19 +142,28 @@ class SyncState:
         """
         Create backup of current state.
 
-        Copies state.json to state.json.bak.
+        Hard-links state.json as state.json.bak (copying where links aren't
+        supported). save() always replaces state.json with a new file, so the
+        link keeps pointing at the backed-up content.
         Called only after successful sync cycle completion.
         """
         if not path.exists():
-            logger.warning(f"Cannot backup non-existent state file {path}")
+            logger.warning("Cannot backup non-existent state file %s", path)
             return
 
         backup_path = path.parent / f"{path.name}.bak"
+        tmp_backup_path = path.parent / f"{path.name}.bak.tmp"
         try:
-            shutil.copy2(path, backup_path)
-            logger.debug(f"Created state backup at {backup_path}")
+            tmp_backup_path.unlink(missing_ok=True)
+            try:
+                os.link(path, tmp_backup_path)
+            except OSError:
+                shutil.copy2(path, tmp_backup_path)
+            # Swap in atomically so a valid backup exists at every point
+            tmp_backup_path.replace(backup_path)
+            logger.debug("Created state backup at %s", backup_path)
         except IOError as e:
-            logger.error(f"Failed to create state backup: {e}")
+            logger.error("Failed to create state backup: %s", e)
 
     def to_dict(self) -> dict:
         """Serialize to dictionary for JSON encoding."""
@@ -128,37 +180,81 @@ class SyncState:
     def from_dict(cls, data: dict) -> "SyncState":
         """Deserialize from dictionary."""
         # Parse datetime strings
-        last_full_sync = None
-        if data.get("last_full_sync"):
-            try:
-                last_full_sync = datetime.fromisoformat(data["last_full_sync"])
-            except (ValueError, TypeError):
-                logger.warning("Invalid last_full_sync in state, ignoring")
-
-        last_incremental_sync = None
-        if data.get("last_incremental_sync"):
-            try:
-                last_incremental_sync = datetime.fromisoformat(data["last_incremental_sync"])
-            except (ValueError, TypeError):
-                logger.warning("Invalid last_incremental_sync in state, ignoring")
-
-        last_updates_check = None
-        if data.get("last_updates_check"):
-            try:
-                last_updates_check = datetime.fromisoformat(data["last_updates_check"])
-            except (ValueError, TypeError):
-                logger.warning("Invalid last_updates_check in state, ignoring")
+        timestamps = {}
+        for key in _STATE_DATETIME_KEYS:
+            value = data.get(key)
+            parsed = _parse_state_datetime(value) if value else None
+            if value and parsed is None:
+                logger.warning("Invalid %s in state, ignoring", key)
+            timestamps[key] = parsed
 
         return cls(
-            last_full_sync=last_full_sync,
-            last_incremental_sync=last_incremental_sync,
             last_tvmaze_page=data.get("last_tvmaze_page", 0),
             highest_tvmaze_id=data.get("highest_tvmaze_id", 0),
             last_filter_hash=data.get("last_filter_hash"),
-            last_updates_check=last_updates_check,
+            **timestamps,
         )
 
 
+def _link_tmpfile(data: bytes, tmp_path: Path) -> bool:
+    """
+    Write data to an unnamed O_TMPFILE and link it in as tmp_path.
+
+    The file only gets a name once its contents are fsynced, so a crash
+    mid-write leaves nothing behind. linkat() can't replace an existing
+    name, so the caller still renames tmp_path over the real file.
+
+    Returns False if O_TMPFILE (or /proc/self/fd) isn't available.
+    """
+    o_tmpfile = getattr(os, 'O_TMPFILE', None)
+    if o_tmpfile is None:
+        return False
+    try:
+        fd = os.open(tmp_path.parent, o_tmpfile | os.O_WRONLY, 0o644)
+    except OSError:
+        # Filesystem or kernel without O_TMPFILE support
+        return False
+    dir_fd = None
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+        tmp_path.unlink(missing_ok=True)
+        # Passing dst_dir_fd makes os.link use linkat(AT_SYMLINK_FOLLOW);
+        # plain link() won't follow the /proc symlink and fails with EXDEV
+        dir_fd = os.open(tmp_path.parent, os.O_RDONLY)
+        try:
+            os.link(f"/proc/self/fd/{fd}", tmp_path.name, dst_dir_fd=dir_fd)
+        except OSError:
+            return False
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+        os.close(fd)
+    return True
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush directory entries (renames) to disk where the OS supports it."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories can't be opened on some platforms (e.g. Windows)
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# State schema, declared once: required integer counters, optional string
+# hash, optional ISO datetimes
+_STATE_INT_KEYS = ("last_tvmaze_page", "highest_tvmaze_id")
+_STATE_OPTIONAL_STR_KEYS = ("last_filter_hash",)
+_STATE_DATETIME_KEYS = ("last_full_sync", "last_incremental_sync", "last_updates_check")
+
+
 def validate_state(data: dict) -> bool:
     """
     Validate state JSON structure.
@@ -174,30 +270,25 @@ def validate_state(data: dict) -> bool:
         logger.error("State data is not a dictionary")
         return False
 
-    # Check for required keys
-    required_keys = ["last_tvmaze_page", "highest_tvmaze_id"]
-    for key in required_keys:
+    # Check required integer keys
+    for key in _STATE_INT_KEYS:
         if key not in data:
-            logger.error(f"Missing required key in state: {key}")
+            logger.error("Missing required key in state: %s", key)
+            return False
+        if not isinstance(data[key], int):
+            logger.error("%s must be an integer", key)
             return False
 
-    # Validate types
-    if not isinstance(data["last_tvmaze_page"], int):
-        logger.error("last_tvmaze_page must be an integer")
-        return False
-
-    if not isinstance(data["highest_tvmaze_id"], int):
-        logger.error("highest_tvmaze_id must be an integer")
-        return False
+    for key in _STATE_OPTIONAL_STR_KEYS:
+        value = data.get(key)
+        if value is not None and not isinstance(value, str):
+            logger.error("%s must be a string", key)
+            return False
 
     # Validate datetime strings if present
-    datetime_fields = ["last_full_sync", "last_incremental_sync", "last_updates_check"]
-    for field in datetime_fields:
-        if data.get(field):
-            try:
-                datetime.fromisoformat(data[field])
-            except (ValueError, TypeError):
-                logger.error(f"Invalid datetime format for {field}")
-                return False
+    for key in _STATE_DATETIME_KEYS:
+        if data.get(key) and _parse_state_datetime(data[key]) is None:
+            logger.error("Invalid datetime format for %s", key)
+            return False
 
     return True
@@ -1,7 +1,10 @@
 """Pytest fixtures for testing."""
 
+import json
+import sqlite3
 import tempfile
 from datetime import UTC, date, datetime
+from functools import cache
 from pathlib import Path
 
 import pytest
@@ -18,23 +21,45 @@ from src.config import (
     SyncConfig,
     TVMazeConfig,
 )
-from src.database import Database
+from src.database import Database, init_schema
 from src.models import Show
 from src.state import SyncState
 
+_FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Per-test directories go on tmpfs where available to avoid disk syncs
+_TMP_ROOT = "/dev/shm" if Path("/dev/shm").is_dir() else None
+
+
+@cache
+def _load_fixture(name: str):
+    """Load a JSON API response from tests/fixtures (parsed once per session)."""
+    return json.loads((_FIXTURES_DIR / name).read_text())
+
 
 @pytest.fixture
 def temp_dir():
     """Create temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory(dir=_TMP_ROOT) as tmpdir:
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def _schema_template():
+    """In-memory database with the current schema, built once per session."""
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    yield conn
+    conn.close()
+
+
 @pytest.fixture
-def test_db(temp_dir):
-    """Create test database."""
-    db_path = temp_dir / "test.db"
-    db = Database(db_path)
+def test_db(_schema_template):
+    """Create test database (in-memory, private to each test)."""
+    # Copying the template's pages is much cheaper than re-running the DDL
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    _schema_template.backup(conn)
+    db = Database(Path(":memory:"), conn=conn)
     yield db
     db.close()
 
@@ -80,9 +105,10 @@ def sample_show_no_tvdb():
     )
 
 
-@pytest.fixture
+# Config dataclasses are frozen; tests derive variants with dataclasses.replace
+@pytest.fixture(scope="module")
 def test_config():
-    """Create test configuration."""
+    """Create test configuration (shared, immutable)."""
     return Config(
         tvmaze=TVMazeConfig(),
         sync=SyncConfig(),
@@ -108,31 +134,10 @@ def test_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tvmaze_show_response():
     """Sample TVMaze API show response."""
-    return {
-        "id": 1,
-        "name": "Breaking Bad",
-        "type": "Scripted",
-        "language": "English",
-        "status": "Ended",
-        "premiered": "2008-01-20",
-        "ended": "2013-09-29",
-        "runtime": 47,
-        "genres": ["Drama", "Crime", "Thriller"],
-        "network": {
-            "name": "AMC",
-            "country": {"code": "US"}
-        },
-        "webChannel": None,
-        "externals": {
-            "tvdb": 81189,
-            "thetvdb": 81189,
-            "imdb": "tt0903747"
-        },
-        "updated": 1704067200
-    }
+    return _load_fixture("tvmaze_show_response.json")
 
 
 # Additional Show fixtures for edge cases
@@ -173,7 +178,7 @@ def sample_show_reality():
 
 
 # TVMaze API response fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tvmaze_show_response_no_tvdb():
     """TVMaze show response without TVDB ID."""
     return {
@@ -198,7 +203,7 @@ def tvmaze_show_response_no_tvdb():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tvmaze_updates_response():
     """TVMaze updates API response."""
     return {
@@ -208,43 +213,14 @@ def tvmaze_updates_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tvmaze_page_response():
     """TVMaze paginated shows response."""
-    return [
-        {
-            "id": 1,
-            "name": "Show 1",
-            "type": "Scripted",
-            "language": "English",
-            "status": "Running",
-            "premiered": "2020-01-01",
-            "runtime": 30,
-            "genres": ["Drama"],
-            "network": {"name": "NBC", "country": {"code": "US"}},
-            "webChannel": None,
-            "externals": {"tvdb": 100, "imdb": "tt001"},
-            "updated": 1704067200
-        },
-        {
-            "id": 2,
-            "name": "Show 2",
-            "type": "Scripted",
-            "language": "English",
-            "status": "Ended",
-            "premiered": "2015-01-01",
-            "runtime": 45,
-            "genres": ["Comedy"],
-            "network": {"name": "CBS", "country": {"code": "US"}},
-            "webChannel": None,
-            "externals": {"tvdb": 200, "imdb": "tt002"},
-            "updated": 1704067300
-        }
-    ]
+    return _load_fixture("tvmaze_page_response.json")
 
 
 # Sonarr API fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_system_status():
     """Sonarr system status response."""
     return {
@@ -261,7 +237,7 @@ def sonarr_system_status():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_root_folders():
     """Sonarr root folders response."""
     return [
@@ -282,7 +258,7 @@ def sonarr_root_folders():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_quality_profiles():
     """Sonarr quality profiles response."""
     return [
@@ -303,7 +279,7 @@ def sonarr_quality_profiles():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_language_profiles():
     """Sonarr language profiles response (v3 only)."""
     return [
@@ -317,7 +293,7 @@ def sonarr_language_profiles():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_tags():
     """Sonarr tags response."""
     return [
@@ -326,64 +302,38 @@ def sonarr_tags():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sonarr_series_lookup():
     """Sonarr series lookup response."""
-    return [
-        {
-            "title": "Breaking Bad",
-            "sortTitle": "breaking bad",
-            "seasonCount": 5,
-            "totalEpisodeCount": 62,
-            "episodeCount": 62,
-            "episodeFileCount": 0,
-            "sizeOnDisk": 0,
-            "status": "ended",
-            "overview": "A high school chemistry teacher...",
-            "network": "AMC",
-            "airTime": "22:00",
-            "images": [],
-            "seasons": [],
-            "year": 2008,
-            "path": "",
-            "profileId": 0,
-            "seasonFolder": True,
-            "monitored": False,
-            "useSceneNumbering": False,
-            "runtime": 47,
-            "tvdbId": 81189,
-            "tvRageId": 18164,
-            "tvMazeId": 169,
-            "firstAired": "2008-01-20T03:00:00Z",
-            "lastInfoSync": None,
-            "seriesType": "standard",
-            "cleanTitle": "breakingbad",
-            "imdbId": "tt0903747",
-            "titleSlug": "breaking-bad",
-            "certification": "TV-MA",
-            "genres": ["Crime", "Drama", "Thriller"],
-            "tags": [],
-            "added": "0001-01-01T00:00:00Z",
-            "ratings": {"votes": 0, "value": 0.0},
-            "statistics": {
-                "seasonCount": 5,
-                "episodeFileCount": 0,
-                "episodeCount": 62,
-                "totalEpisodeCount": 62,
-                "sizeOnDisk": 0,
-                "percentOfEpisodes": 0.0
-            }
-        }
-    ]
+    return _load_fixture("sonarr_series_lookup.json")
+
+
+# Processor fixtures
+@pytest.fixture
+def validated_processor(test_config):
+    """
+    Create ShowProcessor with validated Sonarr params.
+
+    Function-scoped: the processor keeps per-instance selectivity counters.
+    """
+    from src.processor import ShowProcessor
+
+    processor = ShowProcessor(test_config.filters, test_config.sonarr)
+    processor.set_validated_sonarr_params(
+        root_folder="/tv",
+        quality_profile_id=1,
+        language_profile_id=None,
+        tag_ids=[]
+    )
+    return processor
 
 
 # Flask server fixtures
 @pytest.fixture
-def mock_flask_dependencies(test_db, test_state, test_config):
+def mock_flask_dependencies(test_db, test_state, test_config, validated_processor):
     """Create mock dependencies for Flask app."""
     from unittest.mock import Mock
     from src.scheduler import Scheduler
-    from src.processor import ShowProcessor
     from datetime import timedelta
 
     # Create mock scheduler
@@ -396,21 +346,12 @@ def mock_flask_dependencies(test_db, test_state, test_config):
     sonarr_client = Mock()
     sonarr_client.is_healthy = Mock(return_value=True)
 
-    # Create processor
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
     return {
         'db': test_db,
         'state': test_state,
         'scheduler': scheduler,
         'sonarr_client': sonarr_client,
-        'processor': processor,
+        'processor': validated_processor,
         'config': test_config
     }
 
@@ -1,47 +1,110 @@
 """Tests for config module."""
 
-import os
+import re
 import pytest
-import tempfile
+from dataclasses import replace
+from datetime import date
 from pathlib import Path
 
+import yaml
+
 from src.config import (
     ConfigurationError,
+    DateRange,
+    FiltersConfig,
+    GlobalExclude,
+    LoggingConfig,
+    Selection,
+    ServerConfig,
+    SonarrConfig,
+    StorageConfig,
+    TVMazeConfig,
     apply_env_overrides,
     load_config,
+    resolve_env_in_dict,
     resolve_env_value,
     validate_config,
 )
 
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+# Config files are read-only, so write them once per session
+@pytest.fixture(scope="session")
+def config_dir(tmp_path_factory):
+    """Directory for config test files."""
+    return tmp_path_factory.mktemp("config")
+
+
+@pytest.fixture(scope="session")
+def secret_file(config_dir):
+    """File holding a secret for *_FILE env var resolution."""
+    path = config_dir / "secret"
+    path.write_text("secret_value")
+    return path
+
+
+@pytest.fixture(scope="session")
+def valid_yaml_config(config_dir):
+    """YAML config with all required fields."""
+    path = config_dir / "valid.yaml"
+    config_data = {
+        "sonarr": {
+            "url": "http://localhost:8989",
+            "api_key": "test_key",
+            "root_folder": "/tv",
+            "quality_profile": "HD-1080p"
+        },
+        "server": {
+            "api_key": "test-server-key"
+        }
+    }
+    path.write_text(yaml.dump(config_data, Dumper=_YAML_DUMPER))
+    return path
+
+
+@pytest.fixture(scope="session")
+def invalid_yaml_config(config_dir):
+    """File that isn't valid YAML."""
+    path = config_dir / "invalid.yaml"
+    path.write_text("invalid: yaml: content: [")
+    return path
+
+
+@pytest.fixture(scope="session")
+def missing_fields_yaml_config(config_dir):
+    """YAML config missing the Sonarr api_key."""
+    path = config_dir / "missing_fields.yaml"
+    config_data = {
+        "sonarr": {
+            "url": "http://localhost:8989",
+            "root_folder": "/tv",
+            "quality_profile": "HD-1080p"
+        }
+    }
+    path.write_text(yaml.dump(config_data, Dumper=_YAML_DUMPER))
+    return path
+
 
 @pytest.mark.unit
-def test_resolve_env_value_direct():
+def test_resolve_env_value_direct(monkeypatch):
     """Test resolving direct environment variable."""
-    os.environ["TEST_VAR"] = "test_value"
+    monkeypatch.setenv("TEST_VAR", "test_value")
 
     result = resolve_env_value("${TEST_VAR}")
 
     assert result == "test_value"
 
-    del os.environ["TEST_VAR"]
-
 
 @pytest.mark.unit
-def test_resolve_env_value_file():
+def test_resolve_env_value_file(monkeypatch, secret_file):
     """Test resolving environment variable from file."""
-    with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-        f.write("secret_value")
-        temp_file = f.name
-
-    os.environ["TEST_VAR_FILE"] = temp_file
+    monkeypatch.setenv("TEST_VAR_FILE", str(secret_file))
 
     result = resolve_env_value("${TEST_VAR}")
 
     assert result == "secret_value"
 
-    del os.environ["TEST_VAR_FILE"]
-    os.unlink(temp_file)
-
 
 @pytest.mark.unit
 def test_resolve_env_value_missing():
@@ -51,76 +114,74 @@ def test_resolve_env_value_missing():
 
 
 @pytest.mark.unit
-def test_apply_env_overrides():
+def test_apply_env_overrides(monkeypatch):
     """Test applying environment variable overrides."""
-    os.environ["SONARR_URL"] = "http://test:8989"
-    os.environ["EXCLUDE_GENRES"] = "Reality,Talk Show"
-    os.environ["DRY_RUN"] = "true"
+    monkeypatch.setenv("SONARR_URL", "http://test:8989")
+    monkeypatch.setenv("EXCLUDE_GENRES", "Reality,Talk Show")
+    monkeypatch.setenv("DRY_RUN", "true")
 
     config = {}
     config = apply_env_overrides(config)
 
-    assert config.get("sonarr", {}).get("url") == "http://test:8989"
-    assert config.get("exclude", {}).get("genres") == ["Reality", "Talk Show"]
-    assert config.get("dry_run") is True
-
-    del os.environ["SONARR_URL"]
-    del os.environ["EXCLUDE_GENRES"]
-    del os.environ["DRY_RUN"]
+    assert config["sonarr"]["url"] == "http://test:8989"
+    assert config["exclude"]["genres"] == ["Reality", "Talk Show"]
+    assert config["dry_run"] is True
 
 
 @pytest.mark.unit
-def test_load_config_from_env_only():
+def test_load_config_from_env_only(monkeypatch):
     """Test loading config entirely from environment variables."""
-    os.environ["SONARR_URL"] = "http://test:8989"
-    os.environ["SONARR_API_KEY"] = "test_key"
-    os.environ["SONARR_ROOT_FOLDER"] = "/tv"
-    os.environ["SONARR_QUALITY_PROFILE"] = "HD"
-    os.environ["SERVER_API_KEY"] = "test-server-key"
-
-    try:
-        config = load_config(Path("/nonexistent/config.yaml"))
-
-        assert config.sonarr.url == "http://test:8989"
-        assert config.sonarr.api_key == "test_key"
-        assert config.sonarr.root_folder == "/tv"
-        assert config.sonarr.quality_profile == "HD"
-        assert config.server.api_key == "test-server-key"
-
-    finally:
-        del os.environ["SONARR_URL"]
-        del os.environ["SONARR_API_KEY"]
-        del os.environ["SONARR_ROOT_FOLDER"]
-        del os.environ["SONARR_QUALITY_PROFILE"]
-        del os.environ["SERVER_API_KEY"]
-
+    monkeypatch.setenv("SONARR_URL", "http://test:8989")
+    monkeypatch.setenv("SONARR_API_KEY", "test_key")
+    monkeypatch.setenv("SONARR_ROOT_FOLDER", "/tv")
+    monkeypatch.setenv("SONARR_QUALITY_PROFILE", "HD")
+    monkeypatch.setenv("SERVER_API_KEY", "test-server-key")
 
-@pytest.mark.unit
-def test_validate_config_invalid_logging_level(test_config):
-    """Test config validation with invalid logging level."""
-    from src.config import LoggingConfig
-
-    # Create invalid config
-    test_config = test_config.__class__(
-        **{**test_config.__dict__, "logging": LoggingConfig(level="INVALID")}
-    )
+    config = load_config(Path("/nonexistent/config.yaml"))
 
-    with pytest.raises(ConfigurationError, match="Invalid logging.level"):
-        validate_config(test_config)
+    assert config.sonarr.url == "http://test:8989"
+    assert config.sonarr.api_key == "test_key"
+    assert config.sonarr.root_folder == "/tv"
+    assert config.sonarr.quality_profile == "HD"
+    assert config.server.api_key == "test-server-key"
 
 
 @pytest.mark.unit
-def test_validate_config_invalid_port(test_config):
-    """Test config validation with invalid port."""
-    from src.config import ServerConfig
-
-    # Create invalid config
-    test_config = test_config.__class__(
-        **{**test_config.__dict__, "server": ServerConfig(port=99999)}
-    )
-
-    with pytest.raises(ConfigurationError, match="Invalid server.port"):
-        validate_config(test_config)
+@pytest.mark.parametrize("field,value,match", [
+    pytest.param(
+        "logging", LoggingConfig(level="INVALID"), re.compile(r"Invalid logging\.level"),
+        id="logging_level",
+    ),
+    pytest.param("server", ServerConfig(port=99999), re.compile(r"Invalid server\.port"), id="port"),
+    pytest.param(
+        "tvmaze", TVMazeConfig(update_window="invalid"), re.compile(r"Invalid tvmaze\.update_window"),
+        id="update_window",
+    ),
+    pytest.param(
+        "sonarr",
+        SonarrConfig(
+            url="http://localhost:8989",
+            api_key="test",
+            root_folder="/tv",
+            quality_profile="HD",
+            monitor="invalid_mode"
+        ),
+        re.compile(r"Invalid sonarr\.monitor"),
+        id="monitor_mode",
+    ),
+    pytest.param(
+        "filters",
+        FiltersConfig(selections=[Selection(name="Test", premiered=DateRange(after="invalid-date"))]),
+        re.compile(r"Invalid Test\.premiered\.after"),
+        id="premiered_after",
+    ),
+])
+def test_validate_config_invalid(test_config, field, value, match):
+    """Test config validation rejects an invalid sub-config."""
+    invalid_config = replace(test_config, **{field: value})
+
+    with pytest.raises(ConfigurationError, match=match):
+        validate_config(invalid_config)
 
 
 @pytest.mark.unit
@@ -133,12 +194,10 @@ def test_validate_config_valid(test_config):
 # Additional tests for comprehensive coverage
 
 @pytest.mark.unit
-def test_resolve_env_in_dict_nested():
+def test_resolve_env_in_dict_nested(monkeypatch):
     """Test resolving environment variables in nested dictionaries."""
-    from src.config import resolve_env_in_dict
-
-    os.environ["TEST_URL"] = "http://localhost:8989"
-    os.environ["TEST_KEY"] = "secret_key"
+    monkeypatch.setenv("TEST_URL", "http://localhost:8989")
+    monkeypatch.setenv("TEST_KEY", "secret_key")
 
     data = {
         "level1": {
@@ -154,159 +213,90 @@ def test_resolve_env_in_dict_nested():
     assert result["level1"]["level2"]["url"] == "http://localhost:8989"
     assert result["level1"]["level2"]["key"] == "secret_key"
 
-    del os.environ["TEST_URL"]
-    del os.environ["TEST_KEY"]
-
 
 @pytest.mark.unit
-def test_load_config_from_yaml():
+def test_load_config_from_yaml(valid_yaml_config):
     """Test loading config from YAML file."""
-    import yaml
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        config_data = {
-            "sonarr": {
-                "url": "http://localhost:8989",
-                "api_key": "test_key",
-                "root_folder": "/tv",
-                "quality_profile": "HD-1080p"
-            },
-            "server": {
-                "api_key": "test-server-key"
-            }
-        }
-        yaml.dump(config_data, f)
-        config_path = Path(f.name)
+    config = load_config(valid_yaml_config)
 
-    try:
-        config = load_config(config_path)
-        assert config.sonarr.url == "http://localhost:8989"
-        assert config.sonarr.api_key == "test_key"
-        assert config.server.api_key == "test-server-key"
-    finally:
-        os.unlink(config_path)
+    assert config.sonarr.url == "http://localhost:8989"
+    assert config.sonarr.api_key == "test_key"
+    assert config.server.api_key == "test-server-key"
 
 
 @pytest.mark.unit
-def test_load_config_yaml_parse_error():
+def test_load_config_yaml_parse_error(invalid_yaml_config):
     """Test loading config with invalid YAML."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        f.write("invalid: yaml: content: [")
-        config_path = Path(f.name)
-
-    try:
-        with pytest.raises(ConfigurationError, match="Invalid YAML"):
-            load_config(config_path)
-    finally:
-        os.unlink(config_path)
+    with pytest.raises(ConfigurationError, match="Invalid YAML"):
+        load_config(invalid_yaml_config)
 
 
 @pytest.mark.unit
-def test_load_config_missing_required_fields():
+def test_load_config_missing_required_fields(missing_fields_yaml_config):
     """Test loading config with missing required Sonarr fields."""
-    import yaml
-
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        # Missing api_key
-        config_data = {
-            "sonarr": {
-                "url": "http://localhost:8989",
-                "root_folder": "/tv",
-                "quality_profile": "HD-1080p"
-            }
-        }
-        yaml.dump(config_data, f)
-        config_path = Path(f.name)
-
-    try:
-        with pytest.raises(ConfigurationError):
-            load_config(config_path)
-    finally:
-        os.unlink(config_path)
-
-
-@pytest.mark.unit
-def test_validate_config_invalid_update_window(test_config):
-    """Test validation with invalid update window."""
-    from src.config import TVMazeConfig
-
-    test_config = test_config.__class__(
-        **{**test_config.__dict__, "tvmaze": TVMazeConfig(update_window="invalid")}
-    )
-
-    with pytest.raises(ConfigurationError, match="Invalid tvmaze.update_window"):
-        validate_config(test_config)
-
-
-@pytest.mark.unit
-def test_validate_config_invalid_monitor_mode(test_config):
-    """Test validation with invalid monitor mode."""
-    from src.config import SonarrConfig
-
-    test_config = test_config.__class__(
-        **{**test_config.__dict__, "sonarr": SonarrConfig(
-            url="http://localhost:8989",
-            api_key="test",
-            root_folder="/tv",
-            quality_profile="HD",
-            monitor="invalid_mode"
-        )}
-    )
-
-    with pytest.raises(ConfigurationError, match="Invalid sonarr.monitor"):
-        validate_config(test_config)
+    with pytest.raises(ConfigurationError):
+        load_config(missing_fields_yaml_config)
 
 
 @pytest.mark.unit
-def test_apply_env_overrides_integer_parsing():
+def test_apply_env_overrides_integer_parsing(monkeypatch):
     """Test integer parsing in environment overrides."""
-    os.environ["SERVER_PORT"] = "8080"
+    monkeypatch.setenv("SERVER_PORT", "8080")
 
     config = {}
     config = apply_env_overrides(config)
 
-    assert config.get("server", {}).get("port") == 8080
-
-    del os.environ["SERVER_PORT"]
+    assert config["server"]["port"] == 8080
 
 
 @pytest.mark.unit
-def test_resolve_env_value_file_not_found():
+def test_resolve_env_value_file_not_found(monkeypatch):
     """Test resolving env var when file doesn't exist."""
-    os.environ["TEST_VAR_FILE"] = "/nonexistent/file.txt"
+    monkeypatch.setenv("TEST_VAR_FILE", "/nonexistent/file.txt")
 
     with pytest.raises(ConfigurationError, match="File specified"):
         resolve_env_value("${TEST_VAR}")
 
-    del os.environ["TEST_VAR_FILE"]
-
 
 @pytest.mark.unit
-def test_apply_env_overrides_boolean_parsing():
+def test_apply_env_overrides_boolean_parsing(monkeypatch):
     """Test boolean parsing in environment overrides."""
-    os.environ["DRY_RUN"] = "false"
-    os.environ["SONARR_SEARCH_ON_ADD"] = "true"
+    monkeypatch.setenv("DRY_RUN", "false")
+    monkeypatch.setenv("SONARR_SEARCH_ON_ADD", "true")
 
     config = {}
     config = apply_env_overrides(config)
 
-    assert config.get("dry_run") is False
-    assert config.get("sonarr", {}).get("search_on_add") is True
+    assert config["dry_run"] is False
+    assert config["sonarr"]["search_on_add"] is True
+
+
+@pytest.mark.unit
+def test_storage_config_state_path_cached():
+    """Test state path is derived from storage path and built only once."""
+    storage = StorageConfig(path="/data")
+
+    assert storage.state_path == Path("/data/state.json")
+    assert storage.state_path is storage.state_path
+
+
+@pytest.mark.unit
+def test_date_range_parsed_bounds():
+    """Test DateRange exposes parsed date bounds."""
+    date_range = DateRange(after="2020-01-01")
 
-    del os.environ["DRY_RUN"]
-    del os.environ["SONARR_SEARCH_ON_ADD"]
+    assert date_range.after_date == date(2020, 1, 1)
+    assert date_range.before_date is None
+    assert date_range.after_date is date_range.after_date
 
 
 @pytest.mark.unit
-def test_validate_config_invalid_premiered_after(test_config):
-    """Test validation with invalid premiered date format in selection."""
-    from src.config import DateRange, FiltersConfig, Selection
-
-    test_config = test_config.__class__(
-        **{**test_config.__dict__, "filters": FiltersConfig(
-            selections=[Selection(name="Test", premiered=DateRange(after="invalid-date"))]
-        )}
-    )
-
-    with pytest.raises(ConfigurationError, match="Invalid Test.premiered.after"):
-        validate_config(test_config)
+def test_filter_canonical_sorted_and_cached():
+    """Test exclude/selection canonical forms are sorted tuples built once."""
+    exclude = GlobalExclude(genres=["Talk Show", "Reality"])
+    selection = Selection(name="Drama", languages=["German", "English"])
+
+    assert exclude.canonical["genres"] == ("Reality", "Talk Show")
+    assert selection.canonical["languages"] == ("English", "German")
+    assert exclude.canonical is exclude.canonical
+    assert selection.canonical is selection.canonical
@@ -1,10 +1,20 @@
 """Tests for database module."""
 
 import pytest
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
 
+from src.database import Database
 from src.models import ProcessingStatus, Show
 
+# Shared last_checked for seeded rows; no test here depends on distinct values
+_NOW = datetime.now(UTC)
+
+
+def _make_show(i, **fields):
+    """Build "Show <i>" with tvmaze_id=i for bulk inserts."""
+    return Show(tvmaze_id=i, title=f"Show {i}", last_checked=_NOW, **fields)
+
 
 @pytest.mark.unit
 def test_database_upsert_and_get(test_db, sample_show):
@@ -59,7 +69,7 @@ def test_database_get_status_counts(test_db, sample_show):
         tvmaze_id=2,
         title="Show 2",
         processing_status=ProcessingStatus.FILTERED,
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     test_db.upsert_show(show2)
 
@@ -100,13 +110,11 @@ def test_database_mark_show_filtered(test_db, sample_show):
 @pytest.mark.unit
 def test_database_get_highest_tvmaze_id(test_db):
     """Test getting highest TVMaze ID."""
-    show1 = Show(tvmaze_id=100, title="Show 1", last_checked=datetime.now(UTC))
-    show2 = Show(tvmaze_id=200, title="Show 2", last_checked=datetime.now(UTC))
-    show3 = Show(tvmaze_id=150, title="Show 3", last_checked=datetime.now(UTC))
+    show1 = Show(tvmaze_id=100, title="Show 1", last_checked=_NOW)
+    show2 = Show(tvmaze_id=200, title="Show 2", last_checked=_NOW)
+    show3 = Show(tvmaze_id=150, title="Show 3", last_checked=_NOW)
 
-    test_db.upsert_show(show1)
-    test_db.upsert_show(show2)
-    test_db.upsert_show(show3)
+    test_db.upsert_shows([show1, show2, show3])
 
     highest = test_db.get_highest_tvmaze_id()
     assert highest == 200
@@ -115,11 +123,10 @@ def test_database_get_highest_tvmaze_id(test_db):
 @pytest.mark.unit
 def test_database_get_total_count(test_db):
     """Test getting total show count."""
-    show1 = Show(tvmaze_id=1, title="Show 1", last_checked=datetime.now(UTC))
-    show2 = Show(tvmaze_id=2, title="Show 2", last_checked=datetime.now(UTC))
+    show1 = Show(tvmaze_id=1, title="Show 1", last_checked=_NOW)
+    show2 = Show(tvmaze_id=2, title="Show 2", last_checked=_NOW)
 
-    test_db.upsert_show(show1)
-    test_db.upsert_show(show2)
+    test_db.upsert_shows([show1, show2])
 
     count = test_db.get_total_count()
     assert count == 2
@@ -132,24 +139,22 @@ def test_database_get_shows_by_status(test_db):
         tvmaze_id=1,
         title="Show 1",
         processing_status=ProcessingStatus.FILTERED,
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     show2 = Show(
         tvmaze_id=2,
         title="Show 2",
         processing_status=ProcessingStatus.FILTERED,
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     show3 = Show(
         tvmaze_id=3,
         title="Show 3",
         processing_status=ProcessingStatus.ADDED,
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
 
-    test_db.upsert_show(show1)
-    test_db.upsert_show(show2)
-    test_db.upsert_show(show3)
+    test_db.upsert_shows([show1, show2, show3])
 
     filtered_shows = test_db.get_shows_by_status(ProcessingStatus.FILTERED)
     assert len(filtered_shows) == 2
@@ -169,8 +174,6 @@ def test_database_is_healthy(test_db):
 @pytest.mark.unit
 def test_database_init_and_schema(temp_dir):
     """Test database initialization and schema creation."""
-    from src.database import Database
-
     db_path = temp_dir / "new_test.db"
     db = Database(db_path)
 
@@ -185,6 +188,25 @@ def test_database_init_and_schema(temp_dir):
     db.close()
 
 
+@pytest.mark.unit
+def test_database_wraps_existing_connection():
+    """Test an already-initialised connection is used as-is."""
+    import sqlite3
+    from src.database import SCHEMA_VERSION, get_schema_version, init_schema
+
+    conn = sqlite3.connect(":memory:")
+    init_schema(conn)
+    conn.execute("INSERT INTO shows (tvmaze_id, title, last_checked) VALUES (1, 'Kept', '2024-01-01')")
+    conn.commit()
+
+    db = Database(Path(":memory:"), conn=conn)
+
+    assert db.conn is conn
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert db.get_show(1).title == "Kept"
+    db.close()
+
+
 @pytest.mark.unit
 def test_database_close(test_db):
     """Test database close operation."""
@@ -198,19 +220,18 @@ def test_database_close(test_db):
 @pytest.mark.unit
 def test_database_upsert_shows_bulk(test_db):
     """Test bulk upsert operation."""
-    shows = []
-    for i in range(10):
-        show = Show(
-            tvmaze_id=i + 1,
-            title=f"Show {i + 1}",
-            last_checked=datetime.now(UTC)
-        )
-        shows.append(show)
+    shows = [_make_show(i) for i in range(1, 11)]
+    statements = []
+    test_db.conn.set_trace_callback(statements.append)
 
     count = test_db.upsert_shows(shows)
 
+    test_db.conn.set_trace_callback(None)
     assert count == 10
     assert test_db.get_total_count() == 10
+    # The whole batch is written in a single transaction, not one per row
+    assert sum(stmt.startswith("BEGIN") for stmt in statements) == 1
+    assert sum(stmt.startswith("COMMIT") for stmt in statements) == 1
 
 
 @pytest.mark.unit
@@ -224,15 +245,14 @@ def test_database_upsert_shows_empty(test_db):
 @pytest.mark.unit
 def test_database_get_shows_for_retry(test_db, sample_show_no_tvdb):
     """Test getting shows ready for retry."""
-    from datetime import timedelta
-
     # Insert show with retry in the past
     test_db.upsert_show(sample_show_no_tvdb)
-    past_time = datetime.now(UTC) - timedelta(days=1)
+    now = datetime.now(UTC)
+    past_time = now - timedelta(days=1)
     test_db.mark_show_pending_tvdb(sample_show_no_tvdb.tvmaze_id, retry_after=past_time)
 
     # Get shows ready for retry (abandon_after=1 year)
-    shows = test_db.get_shows_for_retry(now=datetime.now(UTC), abandon_after=timedelta(days=365))
+    shows = test_db.get_shows_for_retry(now=now, abandon_after=timedelta(days=365))
 
     assert len(shows) == 1
     assert shows[0].tvmaze_id == sample_show_no_tvdb.tvmaze_id
@@ -241,15 +261,14 @@ def test_database_get_shows_for_retry(test_db, sample_show_no_tvdb):
 @pytest.mark.unit
 def test_database_get_shows_for_retry_not_ready(test_db, sample_show_no_tvdb):
     """Test getting shows not ready for retry yet."""
-    from datetime import timedelta
-
     # Insert show with retry in the future
     test_db.upsert_show(sample_show_no_tvdb)
-    future_time = datetime.now(UTC) + timedelta(days=1)
+    now = datetime.now(UTC)
+    future_time = now + timedelta(days=1)
     test_db.mark_show_pending_tvdb(sample_show_no_tvdb.tvmaze_id, retry_after=future_time)
 
     # Should not return shows not ready yet
-    shows = test_db.get_shows_for_retry(now=datetime.now(UTC), abandon_after=timedelta(days=365))
+    shows = test_db.get_shows_for_retry(now=now, abandon_after=timedelta(days=365))
 
     assert len(shows) == 0
 
@@ -258,20 +277,71 @@ def test_database_get_shows_for_retry_not_ready(test_db, sample_show_no_tvdb):
 def test_database_get_all_filtered_shows(test_db):
     """Test getting all filtered shows as iterator."""
     # Insert multiple filtered shows
-    for i in range(5):
-        show = Show(
-            tvmaze_id=i + 1,
-            title=f"Show {i + 1}",
+    test_db.upsert_shows([
+        _make_show(i, processing_status=ProcessingStatus.FILTERED, filter_reason="Test reason")
+        for i in range(1, 6)
+    ])
+
+    # Get iterator
+    filtered_shows = test_db.get_all_filtered_shows()
+
+    # Lazily yields rows rather than returning a materialized list
+    assert not isinstance(filtered_shows, list)
+    assert next(filtered_shows).tvmaze_id == 1
+    assert len(list(filtered_shows)) == 4
+
+
+@pytest.mark.unit
+def test_database_get_filtered_shows_for_evaluation(test_db):
+    """Test evaluation iterator loads filter inputs for filtered shows with a TVDB ID."""
+    test_db.upsert_show(Show(
+        tvmaze_id=1,
+        title="Drama",
+        tvdb_id=101,
+        imdb_id="tt0000001",
+        language="English",
+        premiered=date(2020, 1, 1),
+        genres=["Drama"],
+        processing_status=ProcessingStatus.FILTERED,
+        filter_reason="selection: No selection matched",
+    ))
+    test_db.upsert_show(Show(tvmaze_id=2, title="No TVDB", processing_status=ProcessingStatus.FILTERED))
+    test_db.upsert_show(Show(tvmaze_id=3, title="Added", tvdb_id=103, processing_status=ProcessingStatus.ADDED))
+
+    shows = list(test_db.get_filtered_shows_for_evaluation())
+
+    assert [show.tvmaze_id for show in shows] == [1]
+    show = shows[0]
+    assert show.tvdb_id == 101
+    assert show.language == "English"
+    assert show.premiered == date(2020, 1, 1)
+    assert show.genres == ["Drama"]
+    assert show.filter_reason == "selection: No selection matched"
+    assert show.imdb_id is None  # not a filter input, not loaded
+
+
+@pytest.mark.unit
+def test_database_update_refiltered_shows(test_db):
+    """Test applying filter re-evaluation results in one batch."""
+    test_db.upsert_shows([
+        _make_show(
+            i,
             processing_status=ProcessingStatus.FILTERED,
-            filter_reason="Test reason",
-            last_checked=datetime.now(UTC)
+            filter_reason="genre: Excluded genre: Reality",
         )
-        test_db.upsert_show(show)
+        for i in range(1, 4)
+    ])
 
-    # Get iterator
-    filtered_shows = list(test_db.get_all_filtered_shows())
+    test_db.update_refiltered_shows(
+        now_pending=[1, 2],
+        refiltered=[(3, "No selection matched", "selection")]
+    )
 
-    assert len(filtered_shows) == 5
+    assert test_db.get_show(1).processing_status == ProcessingStatus.PENDING
+    assert test_db.get_show(2).processing_status == ProcessingStatus.PENDING
+    show3 = test_db.get_show(3)
+    assert show3.processing_status == ProcessingStatus.FILTERED
+    assert show3.filter_reason == "selection: No selection matched"
 
 
 @pytest.mark.unit
@@ -281,22 +351,20 @@ def test_database_get_filter_reason_counts(test_db):
     show1 = Show(
         tvmaze_id=1,
         title="Show 1",
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     show2 = Show(
         tvmaze_id=2,
         title="Show 2",
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     show3 = Show(
         tvmaze_id=3,
         title="Show 3",
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
 
-    test_db.upsert_show(show1)
-    test_db.upsert_show(show2)
-    test_db.upsert_show(show3)
+    test_db.upsert_shows([show1, show2, show3])
 
     # Mark shows as filtered with different categories
     test_db.mark_show_filtered(show1.tvmaze_id, "Genre excluded", "genre")
@@ -330,17 +398,16 @@ def test_database_get_tvmaze_ids_updated_since(test_db):
         tvmaze_id=1,
         title="Show 1",
         tvmaze_updated_at=1704067200,  # Newer
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
     show2 = Show(
         tvmaze_id=2,
         title="Show 2",
         tvmaze_updated_at=1704000000,  # Older
-        last_checked=datetime.now(UTC)
+        last_checked=_NOW
     )
 
-    test_db.upsert_show(show1)
-    test_db.upsert_show(show2)
+    test_db.upsert_shows([show1, show2])
 
     # Get IDs updated since timestamp
     ids = test_db.get_tvmaze_ids_updated_since(timestamp=1704050000)
@@ -352,8 +419,6 @@ def test_database_get_tvmaze_ids_updated_since(test_db):
 @pytest.mark.unit
 def test_database_mark_show_pending_tvdb(test_db, sample_show_no_tvdb):
     """Test marking show as pending TVDB."""
-    from datetime import timedelta
-
     test_db.upsert_show(sample_show_no_tvdb)
 
     retry_after = datetime.now(UTC) + timedelta(weeks=1)
@@ -409,14 +474,10 @@ def test_database_increment_retry_count(test_db, sample_show_no_tvdb):
 def test_database_get_shows_by_status_with_pagination(test_db):
     """Test getting shows by status with limit and offset."""
     # Insert 10 filtered shows
-    for i in range(10):
-        show = Show(
-            tvmaze_id=i + 1,
-            title=f"Show {i + 1}",
-            processing_status=ProcessingStatus.FILTERED,
-            last_checked=datetime.now(UTC)
-        )
-        test_db.upsert_show(show)
+    test_db.upsert_shows([
+        _make_show(i, processing_status=ProcessingStatus.FILTERED)
+        for i in range(1, 11)
+    ])
 
     # Get first page
     page1 = test_db.get_shows_by_status(ProcessingStatus.FILTERED, limit=3, offset=0)
@@ -430,3 +491,16 @@ def test_database_get_shows_by_status_with_pagination(test_db):
     page1_ids = {show.tvmaze_id for show in page1}
     page2_ids = {show.tvmaze_id for show in page2}
     assert len(page1_ids & page2_ids) == 0
+
+
+@pytest.mark.unit
+def test_database_get_shows_by_status_ordered_by_id(test_db):
+    """Test pages are ordered by TVMaze ID regardless of insert order."""
+    test_db.upsert_shows([
+        _make_show(i, processing_status=ProcessingStatus.FILTERED)
+        for i in (5, 2, 4, 1, 3)
+    ])
+
+    page = test_db.get_shows_by_status(ProcessingStatus.FILTERED, limit=3, offset=1)
+
+    assert [show.tvmaze_id for show in page] == [2, 3, 4]
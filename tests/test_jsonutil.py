@@ -0,0 +1,58 @@
+"""Tests for JSON helpers."""
+
+import json
+
+import pytest
+
+from src import jsonutil
+
+
+@pytest.mark.unit
+def test_dumps_returns_compact_bytes():
+    """Test dumps produces compact UTF-8 bytes."""
+    assert jsonutil.dumps(["Drama", "Crime"]) == b'["Drama","Crime"]'
+
+
+@pytest.mark.unit
+def test_dumps_sort_keys():
+    """Test dumps orders keys when requested."""
+    assert jsonutil.dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+
+@pytest.mark.unit
+def test_dumps_matches_stdlib_compact_output():
+    """Test output is byte-identical to compact stdlib json (stable hashes)."""
+    data = {"genres": ["Science-Fiction", "Drama"], "rating": 7.5, "name": "Café", "none": None}
+
+    expected = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+    assert jsonutil.dumps(data, sort_keys=True) == expected
+
+
+@pytest.mark.unit
+def test_dumps_indent_matches_stdlib_indent_2():
+    """Test indented output matches stdlib json.dumps(indent=2)."""
+    data = {"last_tvmaze_page": 3, "last_filter_hash": None, "nested": {"a": [1, 2]}}
+
+    assert jsonutil.dumps(data, indent=True) == json.dumps(data, indent=2).encode()
+
+
+@pytest.mark.unit
+def test_dumps_non_str_keys_matches_stdlib():
+    """Test non-str dict keys are stringified when requested, as stdlib json does."""
+    data = {1: "a", 2.5: "b", None: "c"}
+
+    assert jsonutil.dumps(data, non_str_keys=True) == json.dumps(data, separators=(",", ":")).encode()
+
+
+@pytest.mark.unit
+def test_loads_accepts_str_and_bytes():
+    """Test loads accepts both str and bytes input."""
+    assert jsonutil.loads('["Drama"]') == ["Drama"]
+    assert jsonutil.loads(b'["Drama"]') == ["Drama"]
+
+
+@pytest.mark.unit
+def test_loads_invalid_raises_json_decode_error():
+    """Test invalid input raises the shared JSONDecodeError type."""
+    with pytest.raises(jsonutil.JSONDecodeError):
+        jsonutil.loads("invalid json [")
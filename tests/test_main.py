@@ -1,82 +1,69 @@
-"""Tests for main application logic."""
+"""
+Tests for main application logic.
+
+Multi-phase sync flows are marked integration; deselect them for a quick
+unit-only run with: pytest -m "not integration"
+"""
 
 import pytest
+from dataclasses import replace
 from datetime import UTC, timedelta, datetime
-from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
+from unittest.mock import Mock, patch
+from types import SimpleNamespace
 
+import src.main as main_module
 from src.main import (
+    CHECKPOINT_INTERVAL_PAGES,
     parse_duration,
     setup_logging,
     process_single_show,
+    retry_pending_tvdb,
+    run_initial_sync,
+    sync_cycle,
+    sync_selections_to_sonarr,
 )
-from src.models import Show, Decision, ProcessingResult, SyncStats, SonarrParams
-from src.clients.tvmaze import TVMazeRateLimitError, TVMazeNotFoundError
-
-
-# Duration parsing tests
-
-def test_parse_duration_seconds():
-    """Test parsing seconds."""
-    assert parse_duration("30s") == timedelta(seconds=30)
-
-
-def test_parse_duration_minutes():
-    """Test parsing minutes."""
-    assert parse_duration("45m") == timedelta(minutes=45)
-
-
-def test_parse_duration_hours():
-    """Test parsing hours."""
-    assert parse_duration("6h") == timedelta(hours=6)
-
-
-def test_parse_duration_days():
-    """Test parsing days."""
-    assert parse_duration("7d") == timedelta(days=7)
-
+from src.config import LoggingConfig
+from src.models import Show, ProcessingStatus
+from src.clients.sonarr import AddResult
 
-def test_parse_duration_weeks():
-    """Test parsing weeks."""
-    assert parse_duration("2w") == timedelta(weeks=2)
 
+# Batch timestamps passed to process_single_show
+_NOW = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+_RETRY_AFTER = _NOW + timedelta(hours=3)
 
-def test_parse_duration_years():
-    """Test parsing years."""
-    assert parse_duration("1y") == timedelta(days=365)
-    assert parse_duration("2y") == timedelta(days=730)
-
-
-def test_parse_duration_invalid_unit():
-    """Test invalid duration unit."""
-    with pytest.raises(ValueError, match="Invalid duration unit"):
-        parse_duration("10x")
-
-
-def test_parse_duration_empty_string():
-    """Test empty duration string."""
-    with pytest.raises(ValueError, match="cannot be empty"):
-        parse_duration("")
-
-
-def test_parse_duration_invalid_value():
-    """Test invalid duration value (non-numeric)."""
-    with pytest.raises(ValueError, match="Invalid duration value"):
-        parse_duration("abch")
 
+# Duration parsing tests
 
-def test_parse_duration_too_short():
-    """Test duration string that's too short."""
-    with pytest.raises(ValueError, match="Invalid duration format"):
-        parse_duration("h")
+@pytest.mark.parametrize("spec,expected", [
+    ("30s", timedelta(seconds=30)),
+    ("45m", timedelta(minutes=45)),
+    ("6h", timedelta(hours=6)),
+    ("7d", timedelta(days=7)),
+    ("2w", timedelta(weeks=2)),
+    ("1y", timedelta(days=365)),
+    ("2y", timedelta(days=730)),
+])
+def test_parse_duration_valid(spec, expected):
+    """Test parsing each supported duration unit."""
+    assert parse_duration(spec) == expected
+
+
+@pytest.mark.parametrize("spec,match", [
+    pytest.param("10x", "Invalid duration unit", id="invalid_unit"),
+    pytest.param("", "cannot be empty", id="empty_string"),
+    pytest.param("abch", "Invalid duration value", id="invalid_value"),
+    pytest.param("h", "Invalid duration format", id="too_short"),
+])
+def test_parse_duration_invalid(spec, match):
+    """Test malformed duration strings are rejected."""
+    with pytest.raises(ValueError, match=match):
+        parse_duration(spec)
 
 
 # Logging setup tests
 
 def test_setup_logging_json():
     """Test JSON logging setup."""
-    from src.config import LoggingConfig
-
     config = LoggingConfig(level="INFO", format="json")
     setup_logging(config)
 
@@ -86,8 +73,6 @@ def test_setup_logging_json():
 
 def test_setup_logging_text():
     """Test text logging setup."""
-    from src.config import LoggingConfig
-
     config = LoggingConfig(level="DEBUG", format="text")
     setup_logging(config)
 
@@ -96,242 +81,114 @@ def test_setup_logging_text():
 
 # process_single_show tests
 
-def test_process_single_show_add(test_db, test_config, mock_sonarr_client, sample_show, sync_stats):
-    """Test processing a show that should be added."""
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
-    # Configure Sonarr client to return success
-    mock_sonarr_client.lookup_series.return_value = {"tvdbId": sample_show.tvdb_id}
-    mock_sonarr_client.add_series.return_value.success = True
-    mock_sonarr_client.add_series.return_value.series_id = 1
-
-    # Process show
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show, sync_stats)
-
-    # Verify show was added
-    assert sync_stats.shows_added == 1
-    assert sync_stats.shows_processed == 1
-
-
-def test_process_single_show_filter(test_db, test_config, mock_sonarr_client, sample_show_reality, sync_stats):
-    """Test processing a show that should be filtered."""
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-
-    # Process reality show (should be filtered by default config)
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show_reality, sync_stats)
-
-    # Verify show was filtered
-    assert sync_stats.shows_filtered == 1
+@pytest.mark.parametrize("show_fixture,lookup_result,add_result,counter", [
+    pytest.param(
+        "sample_show", {"tvdbId": 12345}, AddResult(success=True, series_id=1), "shows_added",
+        id="add",
+    ),
+    # Filtered by the default config's Reality exclusion before Sonarr is consulted
+    pytest.param("sample_show_reality", None, None, "shows_filtered", id="filter"),
+    pytest.param("sample_show_no_tvdb", None, None, "shows_skipped", id="pending_tvdb"),
+    pytest.param(
+        "sample_show", {"tvdbId": 12345}, AddResult(success=False, exists=True), "shows_exists",
+        id="exists",
+    ),
+    pytest.param(
+        "sample_show", {"tvdbId": 12345}, AddResult(success=False, error="API error"), "shows_failed",
+        id="failed",
+    ),
+    # Lookup miss is treated like a missing TVDB ID
+    pytest.param("sample_show", None, None, "shows_skipped", id="lookup_not_found"),
+])
+def test_process_single_show_outcome(
+    request, test_db, test_config, mock_sonarr_client, sync_stats, validated_processor,
+    show_fixture, lookup_result, add_result, counter,
+):
+    """Test each processing outcome is recorded in the matching counter."""
+    show = request.getfixturevalue(show_fixture)
+    mock_sonarr_client.lookup_series.return_value = lookup_result
+    mock_sonarr_client.add_series.return_value = add_result
+
+    process_single_show(test_db, test_config, mock_sonarr_client, validated_processor, show, sync_stats, _NOW, _RETRY_AFTER)
+
+    assert getattr(sync_stats, counter) == 1
     assert sync_stats.shows_processed == 1
 
 
-def test_process_single_show_dry_run(test_db, test_config, mock_sonarr_client, sample_show, sync_stats):
+def test_process_single_show_dry_run(test_db, test_config, mock_sonarr_client, sample_show, sync_stats, validated_processor):
     """Test dry run mode."""
-    from src.processor import ShowProcessor
-
     # Create new config with dry_run enabled
-    dry_run_config = test_config.__class__(
-        **{**test_config.__dict__, 'dry_run': True}
-    )
-
-    processor = ShowProcessor(dry_run_config.filters, dry_run_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
+    dry_run_config = replace(test_config, dry_run=True)
 
     # Process show
-    process_single_show(test_db, dry_run_config, mock_sonarr_client, processor, sample_show, sync_stats)
+    process_single_show(test_db, dry_run_config, mock_sonarr_client, validated_processor, sample_show, sync_stats, _NOW, _RETRY_AFTER)
 
     # Verify Sonarr was not called
     mock_sonarr_client.add_series.assert_not_called()
 
 
-def test_process_single_show_pending_tvdb(test_db, test_config, mock_sonarr_client, sample_show_no_tvdb, sync_stats):
-    """Test processing show without TVDB ID."""
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
-    # Process show without TVDB
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show_no_tvdb, sync_stats)
+def test_process_single_show_uses_batch_timestamps(test_db, test_config, mock_sonarr_client, validated_processor, sample_show_no_tvdb, sync_stats):
+    """Test that caller-supplied timestamps are used for last_checked and retry scheduling."""
+    process_single_show(test_db, test_config, mock_sonarr_client, validated_processor, sample_show_no_tvdb, sync_stats, _NOW, _RETRY_AFTER)
 
-    # Verify show was skipped
-    assert sync_stats.shows_skipped == 1
+    stored = test_db.get_show(sample_show_no_tvdb.tvmaze_id)
+    assert stored.last_checked == _NOW
+    assert stored.pending_since == _NOW
+    assert stored.retry_after == _RETRY_AFTER
 
 
-def test_process_single_show_exists(test_db, test_config, mock_sonarr_client, sample_show, sync_stats):
-    """Test processing show that already exists."""
-    from src.processor import ShowProcessor
-    from src.clients.sonarr import AddResult
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
-    # Configure Sonarr to return "exists"
-    mock_sonarr_client.lookup_series.return_value = {"tvdbId": sample_show.tvdb_id}
-    mock_sonarr_client.add_series.return_value = AddResult(
-        success=False,
-        exists=True,
-        series_id=None,
-        error=None
-    )
-
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show, sync_stats)
-
-    # Verify show was marked as exists
-    assert sync_stats.shows_exists == 1
-
-
-def test_process_single_show_failed(test_db, test_config, mock_sonarr_client, sample_show, sync_stats):
-    """Test processing show that fails to add."""
-    from src.processor import ShowProcessor
-    from src.clients.sonarr import AddResult
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
-    # Configure Sonarr to return error
-    mock_sonarr_client.lookup_series.return_value = {"tvdbId": sample_show.tvdb_id}
-    mock_sonarr_client.add_series.return_value = AddResult(
-        success=False,
-        exists=False,
-        series_id=None,
-        error="API error"
-    )
-
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show, sync_stats)
-
-    # Verify show was marked as failed
-    assert sync_stats.shows_failed == 1
-
-
-def test_process_single_show_lookup_not_found(test_db, test_config, mock_sonarr_client, sample_show, sync_stats):
-    """Test processing when Sonarr lookup fails."""
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
-    # Configure Sonarr to return None (not found)
-    mock_sonarr_client.lookup_series.return_value = None
-
-    process_single_show(test_db, test_config, mock_sonarr_client, processor, sample_show, sync_stats)
-
-    # Should be marked as skipped/pending
-    assert sync_stats.shows_skipped == 1
+# Sync cycle tests (simplified integration tests)
 
+@pytest.fixture
+def sync_ops(monkeypatch):
+    """Replace the sync phases sync_cycle dispatches to with mocks."""
+    ops = SimpleNamespace(initial=Mock(), incremental=Mock(), retry=Mock())
+    monkeypatch.setattr(main_module, "run_initial_sync", ops.initial)
+    monkeypatch.setattr(main_module, "run_incremental_sync", ops.incremental)
+    monkeypatch.setattr(main_module, "retry_pending_tvdb", ops.retry)
+    return ops
 
-# Sync cycle tests (simplified integration tests)
 
-@patch('src.main.run_initial_sync')
-@patch('src.main.retry_pending_tvdb')
-def test_sync_cycle_initial(mock_retry, mock_initial, test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, sync_stats):
+@pytest.mark.integration
+def test_sync_cycle_initial(sync_ops, test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor):
     """Test sync cycle when no previous sync."""
-    from src.main import sync_cycle
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
     # No previous sync
     test_state.last_full_sync = None
 
-    sync_cycle(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, processor)
+    sync_cycle(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor)
 
     # Should have called initial sync
-    mock_initial.assert_called_once()
-    mock_retry.assert_called_once()
+    sync_ops.initial.assert_called_once()
+    sync_ops.incremental.assert_not_called()
+    sync_ops.retry.assert_called_once()
 
 
-@patch('src.main.run_incremental_sync')
-@patch('src.main.retry_pending_tvdb')
-def test_sync_cycle_incremental(mock_retry, mock_incremental, test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, sync_stats):
+@pytest.mark.integration
+def test_sync_cycle_incremental(sync_ops, test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor):
     """Test sync cycle when previous sync exists."""
-    from src.main import sync_cycle
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
     # Set previous sync
     test_state.last_full_sync = datetime.now(UTC)
 
-    sync_cycle(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, processor)
+    sync_cycle(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor)
 
     # Should have called incremental sync
-    mock_incremental.assert_called_once()
-    mock_retry.assert_called_once()
+    sync_ops.incremental.assert_called_once()
+    sync_ops.initial.assert_not_called()
+    sync_ops.retry.assert_called_once()
 
 
 # Run initial sync test (basic)
 
-def test_run_initial_sync_pagination(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, sync_stats):
+@pytest.mark.integration
+def test_run_initial_sync_pagination(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, tvmaze_page_response, sync_stats, validated_processor):
     """Test initial sync with pagination."""
-    from src.main import run_initial_sync
-    from src.processor import ShowProcessor
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
     # Mock TVMaze to return empty on second page
     mock_tvmaze_client.get_shows_page.side_effect = [
-        [{"id": 1, "name": "Show 1", "type": "Scripted", "language": "English", "status": "Running",
-          "premiered": "2020-01-01", "runtime": 30, "genres": ["Drama"],
-          "network": {"name": "NBC", "country": {"code": "US"}},
-          "externals": {"tvdb": 100}, "updated": 1704067200}],
+        tvmaze_page_response[:1],
         []  # End of pages
     ]
 
-    run_initial_sync(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, processor, sync_stats)
+    run_initial_sync(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor, sync_stats)
 
     # Should have processed at least one page
     assert sync_stats.shows_processed >= 1
@@ -339,20 +196,9 @@ def test_run_initial_sync_pagination(test_db, test_state, test_config, mock_sona
 
 # Retry pending tests
 
-def test_retry_pending_tvdb_success(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, sample_show_no_tvdb, sync_stats):
+@pytest.mark.integration
+def test_retry_pending_tvdb_success(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, tvmaze_page_response, sample_show_no_tvdb, sync_stats, validated_processor):
     """Test retrying show that now has TVDB ID."""
-    from src.main import retry_pending_tvdb
-    from src.processor import ShowProcessor
-    from datetime import datetime, timedelta
-
-    processor = ShowProcessor(test_config.filters, test_config.sonarr)
-    processor.set_validated_sonarr_params(
-        root_folder="/tv",
-        quality_profile_id=1,
-        language_profile_id=None,
-        tag_ids=[]
-    )
-
     # Insert pending show
     test_db.upsert_show(sample_show_no_tvdb)
     test_db.mark_show_pending_tvdb(
@@ -361,26 +207,23 @@ def test_retry_pending_tvdb_success(test_db, test_state, test_config, mock_sonar
     )
 
     # Mock TVMaze to return show WITH TVDB now
-    show_with_tvdb = sample_show_no_tvdb
-    show_with_tvdb.tvdb_id = 12345
     mock_tvmaze_client.get_show.return_value = {
-        "id": show_with_tvdb.tvmaze_id,
-        "name": show_with_tvdb.title,
-        "type": "Scripted",
-        "language": "English",
-        "status": "Running",
-        "premiered": "2020-01-01",
-        "runtime": 30,
-        "genres": ["Drama"],
-        "network": {"name": "NBC", "country": {"code": "US"}},
-        "externals": {"tvdb": 12345},
-        "updated": 1704067200
+        **tvmaze_page_response[0],
+        "id": sample_show_no_tvdb.tvmaze_id,
+        "name": sample_show_no_tvdb.title,
+        "externals": {"thetvdb": 12345},
     }
+    mock_sonarr_client.lookup_series.return_value = {"tvdbId": 12345, "title": sample_show_no_tvdb.title}
+    mock_sonarr_client.add_series.return_value = AddResult(success=True, series_id=42)
 
-    retry_pending_tvdb(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, processor, sync_stats)
+    retry_pending_tvdb(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor, sync_stats)
 
-    # Should have retried the show
-    assert sync_stats.shows_processed >= 0
+    assert sync_stats.shows_added == 1
+    mock_sonarr_client.lookup_series.assert_called_once_with(12345)
+    stored = test_db.get_show(sample_show_no_tvdb.tvmaze_id)
+    assert stored.tvdb_id == 12345
+    assert stored.processing_status == ProcessingStatus.ADDED
+    assert stored.sonarr_series_id == 42
 
 
 # Additional utility tests can be added here for:
@@ -388,3 +231,60 @@ def test_retry_pending_tvdb_success(test_db, test_state, test_config, mock_sonar
 # - check_for_new_shows
 # - log_startup_banner
 # These would require more complex mocking and are integration-focused
+
+
+# Selections sync tests
+
+def test_sync_selections_to_sonarr_adds_candidates(test_db, test_config, mock_sonarr_client, validated_processor):
+    """Test that all matching shows not in Sonarr are added and recorded."""
+    shows = [
+        Show(tvmaze_id=i, tvdb_id=1000 + i, title=f"Show {i}", language="English")
+        for i in range(1, 6)
+    ]
+    test_db.upsert_shows(shows)
+
+    # Show 1 is already in Sonarr and should not be re-added
+    mock_sonarr_client.get_all_series.return_value = [{"tvdbId": 1001}]
+
+    sync_selections_to_sonarr(test_db, test_config, mock_sonarr_client, validated_processor)
+
+    assert mock_sonarr_client.add_series.call_count == 4
+    assert len(test_db.get_shows_by_status(ProcessingStatus.ADDED)) == 4
+    assert test_db.get_show(1).processing_status == ProcessingStatus.PENDING
+
+
+def test_sync_selections_to_sonarr_records_adds_after_error(test_db, test_config, mock_sonarr_client, validated_processor):
+    """Test that one failing Sonarr call doesn't stop the other adds being recorded."""
+    test_db.upsert_shows([
+        Show(tvmaze_id=i, tvdb_id=1000 + i, title=f"Show {i}", language="English")
+        for i in range(1, 6)
+    ])
+    mock_sonarr_client.get_all_series.return_value = []
+    series_data = mock_sonarr_client.lookup_series.return_value
+
+    def lookup(tvdb_id):
+        if tvdb_id == 1002:
+            raise ConnectionError("Sonarr unavailable")
+        return series_data
+
+    mock_sonarr_client.lookup_series.side_effect = lookup
+
+    sync_selections_to_sonarr(test_db, test_config, mock_sonarr_client, validated_processor)
+
+    assert len(test_db.get_shows_by_status(ProcessingStatus.ADDED)) == 4
+    assert test_db.get_show(2).processing_status == ProcessingStatus.PENDING
+
+
+def test_run_initial_sync_throttles_checkpoints(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor, sync_stats):
+    """Test that state is checkpointed every few pages and once on exit."""
+    pages = CHECKPOINT_INTERVAL_PAGES * 2 + 1
+    mock_tvmaze_client.get_shows_page.side_effect = [
+        [{"id": page + 1, "name": f"Show {page}", "externals": {}}] for page in range(pages)
+    ] + [[]]
+
+    with patch.object(type(test_state), "save") as mock_save:
+        run_initial_sync(test_db, test_state, test_config, mock_sonarr_client, mock_tvmaze_client, validated_processor, sync_stats)
+
+    # Two throttled checkpoints plus the final save on exit
+    assert mock_save.call_count == 3
+    assert test_state.last_tvmaze_page == pages - 1
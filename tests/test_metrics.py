@@ -1,19 +1,24 @@
 """Tests for Prometheus metrics."""
 
-from datetime import UTC, datetime
-from unittest.mock import patch
+from datetime import UTC, datetime, timedelta
 
-import pytest
+from prometheus_client import REGISTRY
 
-from src.metrics import (
-    update_db_metrics,
-    record_sync_complete,
-    sync_last_run_timestamp,
-    sync_healthy,
-    shows_total,
-    sonarr_healthy,
-)
-from src.models import SyncStats, ProcessingStatus
+from src.metrics import update_db_metrics, record_sync_complete
+from src.models import ProcessingStatus
+
+# Fixed cycle length so completion times don't depend on the wall clock
+_SYNC_DURATION = timedelta(seconds=90)
+
+
+def _sample(name, **labels):
+    """Current value of a metric sample in the default registry (None if unset).
+
+    Gauges are set by the code under test just before each assertion and
+    lifetime counters are compared as deltas, so results don't depend on test
+    order. xdist workers are separate processes with their own registry.
+    """
+    return REGISTRY.get_sample_value(name, labels)
 
 
 def test_update_db_metrics_status_counts(test_db, sample_show):
@@ -25,10 +30,8 @@ def test_update_db_metrics_status_counts(test_db, sample_show):
     # Update metrics
     update_db_metrics(test_db)
 
-    # Verify metrics were updated (checking they exist)
-    # We can't easily assert exact values due to how prometheus_client works
-    # but we can verify the function doesn't error
-    assert True  # Function completed without error
+    assert _sample("tvmaze_shows_total", status=ProcessingStatus.ADDED) == 1
+    assert _sample("tvmaze_shows_highest_id") == sample_show.tvmaze_id
 
 
 def test_update_db_metrics_filter_reasons(test_db, sample_show):
@@ -40,14 +43,13 @@ def test_update_db_metrics_filter_reasons(test_db, sample_show):
     # Update metrics
     update_db_metrics(test_db)
 
-    # Metrics should be updated
-    assert True
+    # Reasons are aggregated by the category prefix
+    assert _sample("tvmaze_shows_filtered_by_reason", reason="genre") == 1
+    assert _sample("tvmaze_shows_total", status=ProcessingStatus.FILTERED) == 1
 
 
 def test_update_db_metrics_retry_counts(test_db, sample_show):
     """Test metrics updated with retry counts."""
-    from datetime import datetime, timedelta
-
     # Insert show with retries
     test_db.upsert_show(sample_show)
     test_db.mark_show_pending_tvdb(
@@ -59,7 +61,7 @@ def test_update_db_metrics_retry_counts(test_db, sample_show):
     # Update metrics
     update_db_metrics(test_db)
 
-    assert True
+    assert _sample("tvmaze_shows_pending_retry", reason="1") == 1
 
 
 def test_update_db_metrics_error_handling(test_db):
@@ -67,12 +69,8 @@ def test_update_db_metrics_error_handling(test_db):
     # Close database to cause an error
     test_db.close()
 
-    # Should not raise exception
-    try:
-        update_db_metrics(test_db)
-    except Exception as e:
-        # Error should be caught and logged
-        pass
+    # Error should be caught and logged, not raised
+    update_db_metrics(test_db)
 
 
 def test_record_sync_complete_success(sync_stats):
@@ -83,45 +81,48 @@ def test_record_sync_complete_success(sync_stats):
     sync_stats.shows_exists = 5
     sync_stats.shows_skipped = 3
     sync_stats.shows_failed = 2
-    sync_stats.completed_at = datetime.now(UTC)
+    sync_stats.completed_at = sync_stats.started_at + _SYNC_DURATION
 
     record_sync_complete(sync_stats, success=True)
 
-    # Verify metrics were recorded
-    # sync_healthy should be 1
-    assert True
+    assert _sample("tvmaze_sync_healthy") == 1
+    assert _sample("tvmaze_sync_shows_processed", result="added") == 10
+    assert _sample("tvmaze_sync_shows_processed", result="filtered") == 80
+    assert _sample("tvmaze_sync_shows_processed", result="failed") == 2
 
 
 def test_record_sync_complete_failure(sync_stats):
     """Test recording failed sync."""
-    sync_stats.completed_at = datetime.now(UTC)
+    sync_stats.completed_at = sync_stats.started_at + _SYNC_DURATION
 
     record_sync_complete(sync_stats, success=False)
 
-    # sync_healthy should be 0
-    assert True
+    assert _sample("tvmaze_sync_healthy") == 0
 
 
 def test_record_sync_complete_counters(sync_stats):
     """Test that counters are incremented."""
     sync_stats.shows_added = 5
     sync_stats.shows_filtered = 10
-    sync_stats.completed_at = datetime.now(UTC)
+    sync_stats.completed_at = sync_stats.started_at + _SYNC_DURATION
+
+    # Lifetime counters are shared across tests, so compare deltas
+    added_before = _sample("tvmaze_shows_processed_total", result="added") or 0
 
     # Record twice to test increment
     record_sync_complete(sync_stats, success=True)
     record_sync_complete(sync_stats, success=True)
 
-    # Counters should have incremented
-    assert True
+    assert _sample("tvmaze_shows_processed_total", result="added") == added_before + 10
+    # Per-cycle gauge is overwritten, not accumulated
+    assert _sample("tvmaze_sync_shows_processed", result="added") == 5
 
 
 def test_record_sync_complete_timestamp(sync_stats):
     """Test that timestamp is recorded."""
-    now = datetime.now(UTC)
-    sync_stats.completed_at = now
+    sync_stats.completed_at = sync_stats.started_at + _SYNC_DURATION
 
     record_sync_complete(sync_stats, success=True)
 
-    # sync_last_run_timestamp should be updated
-    assert True
+    assert _sample("tvmaze_sync_last_run_timestamp") == sync_stats.completed_at.timestamp()
+    assert _sample("tvmaze_sync_last_run_duration_seconds") == _SYNC_DURATION.total_seconds()
@@ -41,6 +41,15 @@ def test_show_to_db_dict(sample_show):
     assert "Drama" in data["genres"]
 
 
+@pytest.mark.unit
+def test_show_last_checked_stamped_on_write():
+    """Test last_checked is not defaulted at construction but is always written."""
+    show = Show(tvmaze_id=1, title="Unchecked")
+
+    assert show.last_checked is None
+    assert datetime.fromisoformat(show.to_db_dict()["last_checked"]).tzinfo is not None
+
+
 @pytest.mark.unit
 def test_show_to_dict(sample_show):
     """Test Show.to_dict()."""
@@ -51,6 +60,18 @@ def test_show_to_dict(sample_show):
     assert isinstance(data["genres"], list)
 
 
+@pytest.mark.unit
+def test_show_to_dict_is_subset_of_db_dict(sample_show):
+    """Test to_dict and to_db_dict agree on shared fields except genres encoding."""
+    data = sample_show.to_dict()
+    db_data = sample_show.to_db_dict()
+
+    assert "retry_count" not in data
+    for key, value in data.items():
+        if key != "genres":
+            assert db_data[key] == value
+
+
 @pytest.mark.unit
 def test_processing_result():
     """Test ProcessingResult creation."""
@@ -490,3 +511,74 @@ def test_sync_stats_incomplete():
     assert stats.shows_processed == 0
     assert stats.shows_added == 0
     assert stats.api_calls_tvmaze == 0
+
+
+@pytest.mark.unit
+def test_show_uses_slots(sample_show):
+    """Test Show instances carry no per-instance __dict__."""
+    assert not hasattr(sample_show, "__dict__")
+
+
+@pytest.mark.unit
+def test_show_from_db_rows_matches_from_db_row(test_db, sample_show, sample_show_no_tvdb):
+    """Test bulk row loader produces the same shows as the single-row parser."""
+    test_db.upsert_shows([sample_show, sample_show_no_tvdb])
+
+    rows = test_db.conn.execute("SELECT * FROM shows ORDER BY tvmaze_id").fetchall()
+    shows = list(Show.from_db_rows(rows))
+
+    assert shows == [Show.from_db_row(row) for row in rows]
+    assert shows[0].genres == ["Drama", "Crime", "Thriller"]
+
+
+@pytest.mark.unit
+def test_show_categorical_fields_interned(test_db):
+    """Test repeated categorical values loaded from rows share one string object."""
+    test_db.upsert_shows([
+        Show(tvmaze_id=1, title="One", language="English", type="Scripted"),
+        Show(tvmaze_id=2, title="Two", language="English", type="Scripted"),
+    ])
+
+    rows = test_db.conn.execute("SELECT * FROM shows ORDER BY tvmaze_id").fetchall()
+    first, second = Show.from_db_rows(rows)
+
+    assert first.language is second.language
+    assert first.type is second.type
+    assert Show.from_db_row(rows[0]).title == "One"
+
+
+@pytest.mark.unit
+def test_parse_date_helpers_memoise_and_tolerate_bad_input():
+    """Test cached date parsing returns shared values and None for bad input."""
+    from src.models import _parse_date, _parse_datetime
+
+    assert _parse_date("2008-01-20") == date(2008, 1, 20)
+    assert _parse_date("2008-01-20") is _parse_date("2008-01-20")
+    assert _parse_date("not-a-date") is None
+    assert _parse_date(None) is None
+    assert _parse_date(["2008-01-20"]) is None
+
+    assert _parse_datetime("2024-01-01T00:00:00+00:00") == datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+    assert _parse_datetime("invalid") is None
+
+
+@pytest.mark.unit
+def test_parse_date_helpers_skip_non_iso_without_parsing():
+    """Test values that can't be ISO dates never reach the parser."""
+    from src.models import _date_from_iso, _parse_date
+
+    _date_from_iso.cache_clear()
+
+    assert _parse_date("TBA") is None
+    assert _date_from_iso.cache_info().misses == 0
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("n_genres", [1, 10, 50])
+def test_show_from_tvmaze_response_perf(benchmark, tvmaze_show_response, n_genres):
+    """Benchmark Show.from_tvmaze_response() (run with: pytest -m benchmark)."""
+    data = {**tvmaze_show_response, "genres": [f"Genre {i}" for i in range(n_genres)]}
+
+    show = benchmark(Show.from_tvmaze_response, data)
+
+    assert len(show.genres) == n_genres
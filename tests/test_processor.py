@@ -69,6 +69,32 @@ def test_processor_filter_by_excluded_genre():
     assert "Reality" in result.reason
 
 
+@pytest.mark.unit
+def test_processor_genre_overlap_checks():
+    """Test genre excludes report every overlap and tolerate missing genres."""
+    config = FiltersConfig(
+        exclude=GlobalExclude(genres=["Talk Show", "Reality"]),
+        selections=[Selection(name="Drama", genres=["Drama"])]
+    )
+    sonarr_config = SonarrConfig(
+        url="http://localhost",
+        api_key="test",
+        root_folder="/tv",
+        quality_profile="HD"
+    )
+    processor = ShowProcessor(config, sonarr_config)
+
+    both = Show(tvmaze_id=1, title="Both", tvdb_id=1, genres=["Talk Show", "Drama", "Reality"])
+    result = processor.process(both)
+    assert result.decision == Decision.FILTER
+    assert result.reason == "Excluded genre: Reality, Talk Show"
+
+    no_genres = Show(tvmaze_id=2, title="None", tvdb_id=2, genres=None)
+    result = processor.process(no_genres)
+    assert result.decision == Decision.FILTER
+    assert result.filter_category == "selection"
+
+
 @pytest.mark.unit
 def test_processor_filter_by_selection_language():
     """Test processor filters by selection language."""
@@ -354,6 +380,95 @@ def test_processor_selection_all_criteria_must_match():
     assert result.decision == Decision.FILTER
 
 
+@pytest.mark.unit
+def test_build_sonarr_params_uses_validated_values(sample_show):
+    """Test Sonarr params combine the show identity with validated settings."""
+    from src.models import SonarrParams
+
+    config = FiltersConfig(selections=[Selection(name="All")])
+    sonarr_config = SonarrConfig(
+        url="http://localhost",
+        api_key="test",
+        root_folder="/tv",
+        quality_profile="HD",
+        monitor="future",
+        search_on_add=False
+    )
+    processor = ShowProcessor(config, sonarr_config)
+
+    with pytest.raises(RuntimeError, match="not validated"):
+        processor._build_sonarr_params(sample_show)
+
+    processor.set_validated_sonarr_params(
+        root_folder="/tv",
+        quality_profile_id=5,
+        language_profile_id=None,
+        tag_ids=[10]
+    )
+
+    assert processor._build_sonarr_params(sample_show) == SonarrParams(
+        tvdb_id=sample_show.tvdb_id,
+        title=sample_show.title,
+        root_folder="/tv",
+        quality_profile_id=5,
+        language_profile_id=None,
+        monitor="future",
+        search_on_add=False,
+        tags=[10]
+    )
+
+
+@pytest.mark.unit
+def test_compile_selection_skips_unconstrained_criteria():
+    """Test only constrained criteria are compiled into predicates."""
+    from src.config import DateRange, FloatRange
+    from src.processor import _compile_selection
+
+    assert _compile_selection(Selection(name="All")) == ()
+
+    predicates = _compile_selection(Selection(
+        languages=["English"],
+        premiered=DateRange(),
+        rating=FloatRange(min=7.0),
+    ))
+    assert len(predicates) == 2
+
+
+@pytest.mark.unit
+def test_processor_compiles_excludes_once():
+    """Test only configured global excludes are compiled into checks."""
+    config = FiltersConfig(
+        exclude=GlobalExclude(genres=["Reality"], languages=["Hindi"], networks=["QVC"]),
+        selections=[Selection(name="All")]
+    )
+    sonarr_config = SonarrConfig(
+        url="http://localhost",
+        api_key="test",
+        root_folder="/tv",
+        quality_profile="HD"
+    )
+    processor = ShowProcessor(config, sonarr_config)
+
+    assert len(processor._exclude_checks) == 3
+    assert processor.process(Show(tvmaze_id=1, title="QVC Live", tvdb_id=1, network="QVC")).reason == "Excluded network: QVC"
+    assert processor.process(Show(tvmaze_id=2, title="Drama", tvdb_id=2, language="English"), False).decision == Decision.ADD
+    assert ShowProcessor(FiltersConfig(), sonarr_config)._exclude_checks == ()
+
+
+@pytest.mark.unit
+def test_selection_matcher_reorders_by_rejection_rate(sample_show):
+    """Test the most frequently rejecting predicate moves to the front."""
+    from src.processor import SELECTIVITY_REORDER_INTERVAL, _SelectionMatcher
+
+    matcher = _SelectionMatcher(Selection(languages=["English"], genres=["Nonexistent"]))
+    language_check, genre_check = matcher.predicates
+
+    for _ in range(SELECTIVITY_REORDER_INTERVAL):
+        assert matcher.matches(sample_show) is False
+
+    assert matcher.predicates == (genre_check, language_check)
+
+
 @pytest.mark.unit
 def test_compute_filter_hash():
     """Test filter hash computation."""
@@ -380,6 +495,50 @@ def test_compute_filter_hash():
     # Different filters should produce different hash
     assert hash1 != hash3
 
+    # 16-character hex fingerprint
+    assert len(hash1) == 16
+    int(hash1, 16)
+
+
+@pytest.mark.unit
+def test_compute_filter_hash_matches_full_document_hash():
+    """Test streamed hashing equals hashing the whole canonical JSON document."""
+    import hashlib
+
+    from src import jsonutil
+    from src.processor import _compute_filter_hash
+
+    config = FiltersConfig(
+        exclude=GlobalExclude(genres=["Reality"], networks=["Netflix"]),
+        selections=[
+            Selection(name="Drama", genres=["Drama"], rating=FloatRange(min=7.0)),
+            Selection(name="Recent", premiered=DateRange(after="2020-01-01")),
+        ]
+    )
+    document = jsonutil.dumps({
+        "exclude": config.exclude.canonical,
+        "selections": [sel.canonical for sel in config.selections],
+    }, sort_keys=True)
+
+    assert _compute_filter_hash(config) == hashlib.blake2b(document, digest_size=8).hexdigest()
+    assert _compute_filter_hash(FiltersConfig()) == hashlib.blake2b(
+        jsonutil.dumps({"exclude": GlobalExclude().canonical, "selections": []}, sort_keys=True),
+        digest_size=8,
+    ).hexdigest()
+
+
+@pytest.mark.unit
+def test_compute_filter_hash_cached_per_config():
+    """Test repeated hashing of the same config skips recomputation."""
+    from unittest.mock import patch
+
+    config = FiltersConfig(selections=[Selection(name="Cached")])
+    first = compute_filter_hash(config)
+
+    with patch("src.processor._compute_filter_hash") as mock_compute:
+        assert compute_filter_hash(config) == first
+        mock_compute.assert_not_called()
+
 
 @pytest.mark.unit
 def test_set_validated_sonarr_params():
@@ -541,6 +700,26 @@ def test_check_filter_change_hash_unchanged(test_db, test_state):
     assert test_state.last_filter_hash == current_hash
 
 
+@pytest.mark.unit
+def test_process_many_without_sonarr_params():
+    """Test bulk evaluation can skip SonarrParams for decision-only callers."""
+    config = FiltersConfig(selections=[Selection(name="All")])
+    sonarr_config = SonarrConfig(
+        url="http://localhost",
+        api_key="test",
+        root_folder="/tv",
+        quality_profile="HD"
+    )
+    processor = ShowProcessor(config, sonarr_config)  # params never validated
+    shows = [Show(tvmaze_id=i, title=f"Show {i}", tvdb_id=i) for i in range(1, 4)]
+
+    results = list(processor.process_many(shows, build_sonarr_params=False))
+
+    assert [show for show, _ in results] == shows
+    assert all(result.decision == Decision.ADD for _, result in results)
+    assert all(result.sonarr_params is None for _, result in results)
+
+
 @pytest.mark.unit
 def test_re_evaluate_filtered_shows_status_change(test_db):
     """Test re-evaluation changes show status from filtered to pending."""
@@ -630,6 +809,32 @@ def test_re_evaluate_filtered_shows_reason_update(test_db):
     assert retrieved.processing_status == ProcessingStatus.FILTERED
 
 
+@pytest.mark.unit
+def test_re_evaluate_filtered_shows_unchanged_reason_not_rewritten(test_db):
+    """Test shows still filtered for the same reason are not rewritten."""
+    from unittest.mock import patch
+    from src.processor import re_evaluate_filtered_shows
+
+    show = Show(tvmaze_id=1, title="German Show", tvdb_id=12345, language="German")
+    test_db.upsert_show(show)
+    test_db.mark_show_filtered(show.tvmaze_id, "No selection matched", "selection")
+
+    config = FiltersConfig(selections=[Selection(name="English", languages=["English"])])
+    sonarr_config = SonarrConfig(
+        url="http://localhost",
+        api_key="test",
+        root_folder="/tv",
+        quality_profile="HD"
+    )
+    processor = ShowProcessor(config, sonarr_config)
+
+    with patch.object(test_db, "update_refiltered_shows") as mock_update:
+        count = re_evaluate_filtered_shows(test_db, processor)
+
+    assert count == 0
+    mock_update.assert_called_once_with([], [])
+
+
 @pytest.mark.unit
 def test_global_exclude_types():
     """Test global exclude filters by type."""
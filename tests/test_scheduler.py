@@ -3,10 +3,12 @@
 import time
 import threading
 from datetime import UTC, timedelta, datetime
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 
+import src.scheduler as scheduler_module
 from src.scheduler import Scheduler
 
 
@@ -19,7 +21,8 @@ def test_scheduler_initialization(mock_sync_func):
     assert scheduler.sync_func == mock_sync_func
     assert scheduler._stop_event is not None
     assert scheduler._thread is None
-    assert scheduler._next_run is None
+    assert scheduler._next_run_monotonic is None
+    assert scheduler.next_run is None
 
 
 def test_scheduler_start(short_interval_scheduler):
@@ -120,6 +123,20 @@ def test_scheduler_next_run_property(mock_sync_func):
     scheduler.stop(timeout=2)
 
 
+def test_scheduler_next_run_from_monotonic_deadline(mock_sync_func):
+    """Test next_run is derived from the monotonic deadline."""
+    from unittest.mock import patch
+
+    scheduler = Scheduler(interval=timedelta(hours=1), sync_func=mock_sync_func)
+    scheduler._next_run_monotonic = 1000.0
+
+    with patch("src.scheduler.time.monotonic", return_value=940.0):
+        next_run = scheduler.next_run
+
+    expected = datetime.now(UTC) + timedelta(seconds=60)
+    assert abs((next_run - expected).total_seconds()) < 1
+
+
 def test_scheduler_is_running_property(mock_sync_func):
     """Test is_running property."""
     scheduler = Scheduler(interval=timedelta(hours=1), sync_func=mock_sync_func)
@@ -191,6 +208,38 @@ def test_scheduler_interval_timing(mock_sync_func):
     scheduler.stop(timeout=2)
 
 
+@pytest.mark.parametrize("cycle_seconds, expected_waits", [
+    # A cycle longer than the interval is followed without another wait
+    (30, [20, 0]),
+    # A shorter cycle only waits out the rest of the interval
+    (5, [20, 15]),
+], ids=["overrun", "within_interval"])
+def test_scheduler_interval_measured_from_cycle_start(monkeypatch, cycle_seconds, expected_waits):
+    """Test the wait before each cycle is measured from the previous cycle's start."""
+    clock = [100.0]
+    waits = []
+    monkeypatch.setattr(scheduler_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    def sync():
+        clock[0] += cycle_seconds
+        if len(waits) == len(expected_waits):
+            scheduler._stop_event.set()
+
+    def wait(timeout):
+        # Time passes until the deadline; nothing triggers a manual run
+        waits.append(timeout)
+        clock[0] += timeout
+        return False
+
+    scheduler = Scheduler(interval=timedelta(seconds=20), sync_func=sync)
+    scheduler._trigger_event = Mock(wait=Mock(side_effect=wait))
+
+    # Run the loop on this thread so no real sleeps are involved
+    scheduler._run_loop()
+
+    assert waits == expected_waits
+
+
 def test_scheduler_thread_safety(mock_sync_func):
     """Test scheduler thread safety with concurrent triggers."""
     scheduler = Scheduler(interval=timedelta(seconds=1), sync_func=mock_sync_func)
@@ -215,3 +264,19 @@ def test_scheduler_thread_safety(mock_sync_func):
 
     # Cleanup
     scheduler.stop(timeout=2)
+
+
+def test_scheduler_safe_log_leaves_global_logging_state(mock_sync_func, caplog):
+    """Test _safe_log logs directly while running without toggling raiseExceptions."""
+    import logging
+    from unittest.mock import patch
+
+    scheduler = Scheduler(interval=timedelta(hours=1), sync_func=mock_sync_func)
+
+    with patch.object(Scheduler, "_has_open_handler") as has_open_handler:
+        with caplog.at_level(logging.INFO, logger="src.scheduler"):
+            scheduler._safe_log("info", "running message")
+
+    has_open_handler.assert_not_called()
+    assert "running message" in caplog.text
+    assert logging.raiseExceptions is True
@@ -15,6 +15,59 @@ def test_create_app(flask_app):
     assert flask_app.config['TESTING'] is True
 
 
+def test_app_uses_orjson_provider(flask_app):
+    """Test jsonify responses are encoded through the orjson provider."""
+    from flask import jsonify
+
+    from src.server import OrjsonProvider
+
+    assert isinstance(flask_app.json, OrjsonProvider)
+
+    with flask_app.app_context():
+        response = jsonify({"title": "Café", "genres": ["Drama"]})
+
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == {"title": "Café", "genres": ["Drama"]}
+
+
+@pytest.mark.parametrize(
+    "args, kwargs, expected",
+    [
+        (({"id": 1},), {}, {"id": 1}),
+        ((1, 2), {}, [1, 2]),
+        ((), {"id": 1}, {"id": 1}),
+        ((), {}, None),
+    ],
+    ids=["single", "multiple", "kwargs", "empty"],
+)
+def test_orjson_provider_response_args(flask_app, args, kwargs, expected):
+    """Test the provider follows jsonify()'s argument rules."""
+    with flask_app.app_context():
+        response = flask_app.json.response(*args, **kwargs)
+
+    assert json.loads(response.data) == expected
+
+
+def test_orjson_provider_response_rejects_args_and_kwargs(flask_app):
+    """Test mixing positional and keyword data is rejected."""
+    with pytest.raises(TypeError, match="not both"):
+        flask_app.json.response({"id": 1}, title="x")
+
+
+def test_orjson_provider_dumps_options(flask_app):
+    """Test supported dumps() options are honoured and others rejected."""
+    assert flask_app.json.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    assert flask_app.json.dumps({"a": 1}, indent=2) == '{\n  "a": 1\n}'
+
+    # Formatting-only options (as passed by TaggedJSONSerializer) are ignored
+    assert flask_app.json.dumps({"a": "é"}, separators=(",", ":"), ensure_ascii=True) == '{"a":"é"}'
+    # Non-str keys are stringified like stdlib json
+    assert flask_app.json.dumps({1: "x"}) == '{"1":"x"}'
+
+    with pytest.raises(TypeError, match="default"):
+        flask_app.json.dumps({"a": 1}, default=str)
+
+
 def test_health_endpoint(flask_client):
     """Test /health endpoint."""
     response = flask_client.get('/health')
@@ -80,6 +133,30 @@ def test_metrics_content_type(flask_client):
     assert 'version=' in response.content_type
 
 
+def test_metrics_payload_cached_within_ttl(flask_client):
+    """Test scrapes within the TTL reuse one DB refresh."""
+    from unittest.mock import patch
+
+    with patch("src.server.update_db_metrics") as update_db_metrics:
+        first = flask_client.get('/metrics')
+        second = flask_client.get('/metrics')
+
+    assert update_db_metrics.call_count == 1
+    assert first.data == second.data
+
+
+def test_metrics_payload_refreshed_after_ttl(flask_client):
+    """Test the metrics payload is regenerated once the TTL has passed."""
+    from unittest.mock import patch
+
+    with patch("src.server.update_db_metrics") as update_db_metrics, \
+            patch("src.server.METRICS_CACHE_TTL_SECONDS", 0):
+        flask_client.get('/metrics')
+        flask_client.get('/metrics')
+
+    assert update_db_metrics.call_count == 2
+
+
 def test_trigger_endpoint_success(auth_client, mock_flask_dependencies):
     """Test /trigger endpoint when scheduler is not running."""
     scheduler = mock_flask_dependencies['scheduler']
@@ -167,6 +244,16 @@ def test_shows_endpoint_no_status_filter(auth_client):
     assert isinstance(data, list)
 
 
+def test_stream_json_array():
+    """Test streamed JSON arrays decode to the same list."""
+    from src.server import _stream_json_array
+
+    items = [{"tvmaze_id": 1, "title": "Café"}, {"tvmaze_id": 2, "genres": ["Drama"]}]
+
+    assert json.loads(b"".join(_stream_json_array(items))) == items
+    assert json.loads(b"".join(_stream_json_array([]))) == []
+
+
 def test_refilter_endpoint_success(auth_client, mock_flask_dependencies, sample_show):
     """Test /refilter endpoint success."""
     db = mock_flask_dependencies['db']
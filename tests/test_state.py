@@ -1,8 +1,9 @@
 """Tests for state module."""
 
 import json
+import os
 import pytest
-from datetime import datetime
+from datetime import UTC, datetime
 
 from src.state import SyncState, validate_state
 
@@ -53,6 +54,27 @@ def test_state_backup(temp_dir):
     assert backup_path.exists()
 
 
+@pytest.mark.unit
+def test_state_backup_survives_later_save(temp_dir):
+    """Test the backup keeps the old content after state.json is rewritten."""
+    state_path = temp_dir / "state.json"
+    backup_path = temp_dir / "state.json.bak"
+
+    state = SyncState(highest_tvmaze_id=1)
+    state.save(state_path)
+    state.backup(state_path)
+
+    state.highest_tvmaze_id = 2
+    state.save(state_path)
+    state.backup(state_path)
+    state.highest_tvmaze_id = 3
+    state.save(state_path)
+
+    assert json.loads(backup_path.read_text())["highest_tvmaze_id"] == 2
+    assert json.loads(state_path.read_text())["highest_tvmaze_id"] == 3
+    assert not (temp_dir / "state.json.bak.tmp").exists()
+
+
 @pytest.mark.unit
 def test_state_to_dict():
     """Test state serialization to dict."""
@@ -124,6 +146,18 @@ def test_validate_state_invalid_type():
     assert validate_state(data) is False
 
 
+@pytest.mark.unit
+def test_validate_state_invalid_filter_hash_type():
+    """Test state validation rejects a non-string filter hash."""
+    data = {
+        "last_tvmaze_page": 0,
+        "highest_tvmaze_id": 0,
+        "last_filter_hash": 12345,
+    }
+
+    assert validate_state(data) is False
+
+
 @pytest.mark.unit
 def test_state_load_with_corrupt_file_and_backup(temp_dir):
     """Test loading state with corrupt file but valid backup."""
@@ -189,12 +223,14 @@ def test_state_save_ioerror_cleanup(temp_dir, monkeypatch):
         if call_count[0] == 1 and str(args[0]).endswith('.tmp'):
             # Create the file first so cleanup can be tested
             f = original_open(*args, **kwargs)
-            f.write('partial')
+            f.write(b'partial' if 'b' in f.mode else 'partial')
             f.close()
             raise IOError("Simulated write error")
         return original_open(*args, **kwargs)
 
     monkeypatch.setattr(builtins, 'open', mock_open)
+    # Exercise the named temp file fallback rather than O_TMPFILE
+    monkeypatch.delattr(os, 'O_TMPFILE', raising=False)
 
     state = SyncState(highest_tvmaze_id=777)
 
@@ -279,3 +315,118 @@ def test_validate_state_invalid_datetime_strings():
 
     # Should fail validation due to invalid datetime
     assert validate_state(data) is False
+
+
+@pytest.mark.unit
+def test_validate_state_rejects_malformed_datetime_without_parsing():
+    """Test values that don't look like ISO datetimes skip fromisoformat."""
+    from unittest.mock import patch
+
+    data = SyncState().to_dict()
+    data["last_full_sync"] = "garbage"
+
+    with patch("src.state._parse_datetime") as parse:
+        assert validate_state(data) is False
+
+    parse.assert_not_called()
+
+
+@pytest.mark.unit
+def test_validate_state_rejects_out_of_range_datetime():
+    """Test ISO-shaped but impossible datetimes still fail validation."""
+    data = SyncState().to_dict()
+    data["last_updates_check"] = "2024-13-01T00:00:00"
+
+    assert validate_state(data) is False
+    assert SyncState.from_dict(data).last_updates_check is None
+
+
+@pytest.mark.unit
+def test_state_load_parses_each_timestamp_once(temp_dir):
+    """Test validation and deserialization share one parse per timestamp."""
+    from src.state import _parse_datetime
+
+    state_path = temp_dir / "state.json"
+    SyncState(last_full_sync=datetime(2024, 1, 1, tzinfo=UTC)).save(state_path)
+
+    _parse_datetime.cache_clear()
+    loaded = SyncState.load(state_path)
+
+    assert loaded.last_full_sync == datetime(2024, 1, 1, tzinfo=UTC)
+    info = _parse_datetime.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+@pytest.mark.unit
+def test_state_save_skips_unchanged_content(temp_dir):
+    """Test save() only rewrites the file when the serialized state changes."""
+    from unittest.mock import patch
+
+    state_path = temp_dir / "state.json"
+    state = SyncState(highest_tvmaze_id=10)
+    state.save(state_path)
+
+    with patch("pathlib.Path.replace") as replace:
+        state.save(state_path)
+    replace.assert_not_called()
+
+    state.highest_tvmaze_id = 11
+    state.save(state_path)
+    assert SyncState.load(state_path).highest_tvmaze_id == 11
+
+    # Recreated if the file disappeared underneath us
+    state_path.unlink()
+    state.save(state_path)
+    assert state_path.exists()
+
+
+@pytest.mark.unit
+def test_state_save_fsyncs_file_and_directory(temp_dir):
+    """Test save() flushes the temp file and the directory entry."""
+    from unittest.mock import patch
+
+    state_path = temp_dir / "state.json"
+
+    with patch("src.state.os.fsync") as fsync:
+        SyncState(highest_tvmaze_id=1).save(state_path)
+
+    assert fsync.call_count == 2
+    assert SyncState.load(state_path).highest_tvmaze_id == 1
+
+
+@pytest.mark.unit
+def test_state_save_without_o_tmpfile(temp_dir, monkeypatch):
+    """Test save() falls back to a named temp file without O_TMPFILE."""
+    monkeypatch.delattr(os, 'O_TMPFILE', raising=False)
+    state_path = temp_dir / "state.json"
+
+    SyncState(highest_tvmaze_id=12).save(state_path)
+
+    assert SyncState.load(state_path).highest_tvmaze_id == 12
+    assert not (temp_dir / "state.json.tmp").exists()
+
+
+@pytest.mark.unit
+def test_state_save_failed_write_leaves_no_temp_file(temp_dir):
+    """Test a write that fails before fsync completes leaves no .tmp behind."""
+    from unittest.mock import patch
+
+    state_path = temp_dir / "state.json"
+
+    with patch("src.state.os.fsync", side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            SyncState(highest_tvmaze_id=1).save(state_path)
+
+    assert not state_path.exists()
+    assert not (temp_dir / "state.json.tmp").exists()
+
+
+@pytest.mark.unit
+def test_state_is_slotted():
+    """Test SyncState uses slots like the other model dataclasses."""
+    state = SyncState()
+
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.unknown_field = 1